@@ -9,21 +9,144 @@ import base64
 import io
 
 # Import custom modules for calculations
-from src.option_pricer import black_scholes
+from src.option_pricer import black_scholes, black_scholes_batch, KERNEL_OUTPUTS
 from src.greeks import option_greeks
 from src.pnl import pnl
 from src.strategies import single_leg_strategy, multi_leg_strategy
 from src.data import get_stock_data
+from src.surface import SURFACE_PARAMETERS, evaluate_surface
 
 # Set Streamlit page configuration with automatic dark mode
 st.set_page_config(page_title="Black-Scholes Intuition Tool", layout="wide", initial_sidebar_state="collapsed")
 
+# ----- Cached computations -----
+# Streamlit reruns this whole script on every widget change, so anything expensive lives in
+# a bounded cache. Numeric inputs are rounded before they reach a cache so equivalent slider
+# positions share an entry.
+CACHE_DIGITS = 4
+
+
+def rounded(*values):
+    return tuple(round(float(value), CACHE_DIGITS) for value in values)
+
+
+@st.cache_resource
+def load_logo(path):
+    logo = Image.open(path)
+    buffered = io.BytesIO()
+    logo.save(buffered, format="PNG")
+    return base64.b64encode(buffered.getvalue()).decode()
+
+
+@st.cache_data(max_entries=256)
+def price_heatmap(K, T, r, option_type):
+    vol_range = np.arange(0.00, 1.0, 0.05)
+    price_range = np.linspace(10, 150, 20)
+    # One broadcast call over the (volatility, stock price) grid
+    heatmap_data = black_scholes(price_range[np.newaxis, :], K, T, r, vol_range[:, np.newaxis], option_type)
+    return vol_range, price_range, heatmap_data
+
+
+@st.cache_data(max_entries=128)
+def render_heatmap(K, T, r, option_type, tick_color):
+    vol_range, price_range, heatmap_data = price_heatmap(K, T, r, option_type)
+
+    # Create the heatmap
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    sns.heatmap(heatmap_data, annot=True, fmt=".2f", xticklabels=np.round(price_range, 2),
+                yticklabels=np.round(vol_range, 2), cmap="coolwarm", ax=ax, annot_kws={"size": 7})
+
+    # Set the heatmap background and text colors
+    ax.set_facecolor((0, 0, 0, 0))  # Transparent-like effect with RGBA
+    fig.patch.set_facecolor((0, 0, 0, 0))  # Transparent figure background with RGBA
+
+    # Adjust tick colors on X and Y axes
+    plt.xticks(color=tick_color)  # Dynamic text color for X-axis
+    plt.yticks(color=tick_color)  # Dynamic text color for Y-axis
+
+    # Set X and Y axis labels and title
+    ax.set_xlabel('Stock Price', color=tick_color)
+    ax.set_ylabel('Volatility', color=tick_color)
+    ax.set_title(f'{option_type.capitalize()} Price Heatmap', color=tick_color)
+
+    # Set colorbar and adjust its label and ticks color
+    cbar = ax.collections[0].colorbar
+    cbar.ax.yaxis.set_tick_params(color=tick_color)  # Set color for the colorbar ticks
+    plt.setp(cbar.ax.yaxis.get_ticklabels(), color=tick_color)  # Set color for colorbar labels
+
+    # Cache the rendered PNG rather than the figure so no matplotlib state is kept alive
+    buffered = io.BytesIO()
+    fig.savefig(buffered, format="png", dpi=200, bbox_inches="tight")
+    plt.close(fig)
+    return buffered.getvalue()
+
+
+# Surface mode: default sweep range per input and the largest grid that still gets annotations
+SURFACE_RANGES = {'S': (10.0, 150.0), 'K': (10.0, 150.0), 'T': (0.01, 5.0), 'r': (0.0, 0.1), 'sigma': (0.01, 1.0)}
+ANNOTATION_LIMIT = 625
+
+
+@st.cache_data(max_entries=32)
+def render_surface(base, x_param, x_range, y_param, y_range, resolution, output, option_type, tick_color):
+    x_values = np.linspace(*x_range, resolution)
+    y_values = np.linspace(*y_range, resolution)
+    surface = evaluate_surface(dict(base), x_param, x_values, y_param, y_values, output, option_type)
+
+    # imshow draws the grid as a single image, which stays fast at hundreds of points per side
+    fig, ax = plt.subplots(figsize=(10, 6))
+    image = ax.imshow(surface, origin='lower', aspect='auto', cmap="coolwarm", interpolation='nearest',
+                      extent=(x_values[0], x_values[-1], y_values[0], y_values[-1]))
+    if surface.size <= ANNOTATION_LIMIT:
+        x_step = (x_values[-1] - x_values[0]) / max(resolution - 1, 1)
+        y_step = (y_values[-1] - y_values[0]) / max(resolution - 1, 1)
+        image.set_extent((x_values[0] - x_step / 2, x_values[-1] + x_step / 2,
+                          y_values[0] - y_step / 2, y_values[-1] + y_step / 2))
+        for i, y in enumerate(y_values):
+            for j, x in enumerate(x_values):
+                ax.text(x, y, f"{surface[i, j]:.2f}", ha='center', va='center', fontsize=7)
+
+    ax.set_facecolor((0, 0, 0, 0))
+    fig.patch.set_facecolor((0, 0, 0, 0))
+    ax.tick_params(colors=tick_color)
+    ax.set_xlabel(SURFACE_PARAMETERS[x_param], color=tick_color)
+    ax.set_ylabel(SURFACE_PARAMETERS[y_param], color=tick_color)
+    ax.set_title(f'{option_type.capitalize()} {output} Surface ({resolution}×{resolution})', color=tick_color)
+    cbar = fig.colorbar(image, ax=ax)
+    cbar.ax.yaxis.set_tick_params(color=tick_color)
+    plt.setp(cbar.ax.yaxis.get_ticklabels(), color=tick_color)
+
+    buffered = io.BytesIO()
+    fig.savefig(buffered, format="png", dpi=200, bbox_inches="tight")
+    plt.close(fig)
+    return buffered.getvalue()
+
+
+@st.cache_data(ttl=3600, max_entries=64)
+def load_stock_data(ticker, start, end):
+    return get_stock_data(ticker, start=start, end=end).set_index('Date')
+
+
+@st.cache_data(max_entries=256)
+def option_price_history(ticker, start, end, K, T, r, sigma, option_type):
+    stock_data = load_stock_data(ticker, start, end)
+
+    # Calculate option price and Greeks for every day in one batch
+    path = black_scholes_batch(stock_data['Close'].to_numpy(dtype=float).ravel(), K, T, r, sigma, option_type)
+
+    return pd.DataFrame({
+        'Date': stock_data.index.strftime('%Y-%m-%d'),
+        'Option Price': path['Price'],
+        'Delta': path['Delta'],
+        'Gamma': path['Gamma'],
+        'Theta': path['Theta'],
+        'Vega': path['Vega'],
+        'Rho': path['Rho']
+    }).set_index('Date')
+
+
 # Load LinkedIn logo
-linkedin_logo_path = "src/linkedin_logo.png"
-linkedin_logo = Image.open(linkedin_logo_path)
-buffered = io.BytesIO()
-linkedin_logo.save(buffered, format="PNG")
-encoded_logo = base64.b64encode(buffered.getvalue()).decode()
+encoded_logo = load_logo("src/linkedin_logo.png")
 
 # Custom CSS to adjust theme dynamically for fonts and the heatmap
 st.markdown(f"""
@@ -135,42 +258,32 @@ with tab1:
 
     # Heatmap Section
     st.markdown("### 🌡️ **Option Price Heatmap**")
-    vol_range = np.arange(0.00, 1.0, 0.05)
-    price_range = np.linspace(10, 150, 20)
-    heatmap_data = np.zeros((len(vol_range), len(price_range)))
-
-    for i, vol in enumerate(vol_range):
-        for j, price in enumerate(price_range):
-            heatmap_data[i, j] = black_scholes(price, K, T, r, vol, option_type)
-
-       # Create the heatmap
-    fig, ax = plt.subplots(figsize=(10, 6))
-
-    sns.heatmap(heatmap_data, annot=True, fmt=".2f", xticklabels=np.round(price_range, 2), 
-                yticklabels=np.round(vol_range, 2), cmap="coolwarm", ax=ax, annot_kws={"size": 7})
-
-    # Set the heatmap background and text colors
-    ax.set_facecolor((0, 0, 0, 0))  # Transparent-like effect with RGBA
-    fig.patch.set_facecolor((0, 0, 0, 0))  # Transparent figure background with RGBA
 
     # Color for ticks and labels dynamically based on theme
     tick_color = 'black' if st.get_option('theme.base') == 'light' else 'white'
-    
-    # Adjust tick colors on X and Y axes
-    plt.xticks(color=tick_color)  # Dynamic text color for X-axis
-    plt.yticks(color=tick_color)  # Dynamic text color for Y-axis
 
-    # Set X and Y axis labels and title
-    ax.set_xlabel('Stock Price', color=tick_color)
-    ax.set_ylabel('Volatility', color=tick_color)
-    ax.set_title(f'{option_type.capitalize()} Price Heatmap', color=tick_color)
-
-    # Set colorbar and adjust its label and ticks color
-    cbar = ax.collections[0].colorbar
-    cbar.ax.yaxis.set_tick_params(color=tick_color)  # Set color for the colorbar ticks
-    plt.setp(cbar.ax.yaxis.get_ticklabels(), color=tick_color)  # Set color for colorbar labels
-
-    st.pyplot(fig)
+    heatmap_mode = st.radio('Heatmap Mode', ['Classic', 'Surface'], horizontal=True, key="heatmap_mode")
+    if heatmap_mode == 'Classic':
+        st.image(render_heatmap(*rounded(K, T, r), option_type, tick_color))
+    else:
+        parameters = list(SURFACE_PARAMETERS)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            x_param = st.selectbox('X Axis', parameters, index=parameters.index('S'),
+                                   format_func=SURFACE_PARAMETERS.get, key="surface_x")
+            x_range = st.slider('X Range', *SURFACE_RANGES[x_param], SURFACE_RANGES[x_param], key=f"surface_x_{x_param}")
+        with col2:
+            y_choices = [p for p in parameters if p != x_param]
+            y_param = st.selectbox('Y Axis', y_choices, index=y_choices.index('sigma') if 'sigma' in y_choices else 0,
+                                   format_func=SURFACE_PARAMETERS.get, key="surface_y")
+            y_range = st.slider('Y Range', *SURFACE_RANGES[y_param], SURFACE_RANGES[y_param], key=f"surface_y_{y_param}")
+        with col3:
+            surface_output = st.selectbox('Output', KERNEL_OUTPUTS, key="surface_output")
+            resolution = st.slider('Grid Size', 10, 500, 200, step=10, key="surface_resolution")
+
+        base = tuple(zip(parameters, rounded(S, K, T, r, volatility)))
+        st.image(render_surface(base, x_param, rounded(*x_range), y_param, rounded(*y_range), resolution,
+                                surface_output, option_type, tick_color))
 
 # ----- TAB 2: Visualizing Over Time -----
 with tab2:
@@ -216,11 +329,7 @@ with tab2:
     option_type_viz = st.selectbox('Option Type', ['call', 'put'], key="option_type_viz")
 
     # Fetch stock data based on ticker and date range
-    stock_data = get_stock_data(ticker_viz, start=start_date, end=end_date)
-
-    # Check if the index is not already a DateTimeIndex and convert if necessary
-    if not pd.api.types.is_datetime64_any_dtype(stock_data.index):
-        stock_data.index = pd.date_range(start=start_date, end=end_date, periods=len(stock_data))
+    stock_data = load_stock_data(ticker_viz.upper(), start_date, end_date)
 
     # Convert DateTimeIndex to strings for proper labeling in Streamlit's line_chart
     stock_data['Date'] = stock_data.index.strftime('%Y-%m-%d')
@@ -241,26 +350,9 @@ with tab2:
     # Add heading for option price chart
     st.markdown(f"### 📈 **{ticker_viz.upper()} Option Price**", unsafe_allow_html=True)
 
-    # Calculate option price for each day
-    option_prices = []
-    greeks_df = []  # Placeholder for storing Greeks for each date
-    for stock_price in stock_data['Close']:
-        option_price = black_scholes(stock_price, K_viz, T_viz, r_viz, volatility_viz, option_type_viz)
-        option_prices.append(option_price)
-        # Compute Greeks
-        greeks = option_greeks(stock_price, K_viz, T_viz, r_viz, volatility_viz, option_type_viz)
-        greeks_df.append(greeks)
-        
     # Display Option Price Chart using Altair
-    option_price_df = pd.DataFrame({
-        'Date': stock_data.index,
-        'Option Price': option_prices,
-        'Delta': [g['Delta'] for g in greeks_df],
-        'Gamma': [g['Gamma'] for g in greeks_df],
-        'Theta': [g['Theta'] for g in greeks_df],
-        'Vega': [g['Vega'] for g in greeks_df],
-        'Rho': [g['Rho'] for g in greeks_df]
-    }).set_index('Date')
+    option_price_df = option_price_history(ticker_viz.upper(), start_date, end_date,
+                                           *rounded(K_viz, T_viz, r_viz, volatility_viz), option_type_viz)
 
     option_chart = alt.Chart(option_price_df.reset_index()).mark_line().encode(
         x=alt.X('Date:T', axis=alt.Axis(labelAngle=-45)),
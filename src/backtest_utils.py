@@ -2,11 +2,219 @@
 
 import numpy as np
 import pandas as pd
+from src.portfolio import Portfolio, CALL, STOCK
 
-def backtest_strategy_with_legs(stock_data, strike_price, option_type, position_type, start_date, end_date):
+TRADING_DAYS = 252
+
+
+def realized_volatility(close, window=21, fallback=0.2):
+    """
+    Annualized close-to-close realized volatility over a trailing window.
+
+    Each day only uses returns up to that day. Until a full window of returns exists, the
+    estimate uses every return so far, and the first two days, with fewer than two returns,
+    take the fallback. Pass history from before the period of interest so those days are
+    covered by full windows.
+
+    Parameters:
+        close (array-like): Close prices.
+        window (int): Rolling window length in trading days.
+        fallback (float): Volatility for days with fewer than two returns.
+
+    Returns:
+        np.ndarray: Volatility per day, same length as close.
+    """
+    log_returns = pd.Series(np.log(np.asarray(close, dtype=float))).diff()
+    vol = log_returns.rolling(window, min_periods=2).std() * np.sqrt(TRADING_DAYS)
+    return vol.fillna(fallback).to_numpy()
+
+
+def _daily_input(values, dates, close):
+    # Scalars stay scalars; series are aligned to the backtest dates; 'realized' derives vol from close
+    if isinstance(values, str):
+        if values != 'realized':
+            raise ValueError("Volatility must be a number, a series or 'realized'.")
+        return realized_volatility(close)
+    if isinstance(values, pd.Series):
+        values = values.copy()
+        values.index = pd.to_datetime(values.index)
+        # Carry values forward only, so no day is priced with a later observation
+        values = values.sort_index().reindex(values.index.union(dates)).ffill().reindex(dates)
+        if values.isna().any():
+            raise ValueError("Daily input series must start on or before the first backtest date.")
+        return values.to_numpy(dtype=float)
+    values = np.asarray(values, dtype=float)
+    if values.ndim and values.shape[0] != len(dates):
+        raise ValueError("Daily inputs must have one value per backtest date.")
+    return values
+
+
+def backtest_portfolio(dates, close, portfolio, r=0.05, volatility=0.2, roll_days=None, relative_strikes=False):
+    """
+    Marks a portfolio of legs to the Black-Scholes model every day, rolling it on a schedule.
+
+    Leg expiries are tenors in years from each roll. On a roll date the expiring position is
+    marked one last time and a fresh one is opened at the same tenors. A leg that expires
+    before the roll settles at intrinsic value on its last trading date and keeps that value
+    until the roll. The whole path is evaluated as array operations over (days, legs).
+
+    Parameters:
+        dates (array-like): Trading dates, ascending.
+        close (array-like): Underlying close price per date.
+        portfolio (Portfolio): Legs to hold.
+        r (float, array-like or pd.Series): Risk-free rate, constant or per date.
+        volatility (float, array-like, pd.Series or 'realized'): Pricing volatility, constant,
+            per date, or the trailing realized volatility of close. backtest_strategy
+            estimates 'realized' on the full stock history before cutting the window.
+        roll_days (int, optional): Calendar days between rolls. Defaults to the longest option
+            tenor, i.e. rolling at expiry; a portfolio of stock legs only is never rolled.
+        relative_strikes (bool): Treat strikes as multiples of the spot price on each roll date.
+
+    Returns:
+        dict: 'value' (n_days, n_positions) marked-to-model values, 'position_pnl'
+            (n_days, n_positions) daily P&L including the close-out of rolled positions,
+            'pnl' (n_days,) its total over positions, 'time_to_expiry' (n_days,) of the
+            longest leg, 'volatility' (n_days,) and 'roll' (n_days,) flags.
+    """
+    dates = pd.DatetimeIndex(dates)
+    close = np.asarray(close, dtype=float)
+    n = close.size
+    if n == 0:
+        empty = np.empty(0)
+        return {'value': np.empty((0, portfolio.n_positions)), 'pnl': empty,
+                'position_pnl': np.empty((0, portfolio.n_positions)), 'time_to_expiry': empty,
+                'volatility': empty, 'roll': np.empty(0, dtype=bool)}
+
+    r = _daily_input(r, dates, close)
+    volatility = _daily_input(volatility, dates, close)
+    options = portfolio.kind != STOCK
+    if roll_days is None and options.any():
+        roll_days = int(round(portfolio.expiry[options].max() * 365))
+    if roll_days is not None and roll_days <= 0:
+        raise ValueError("roll_days must be positive.")
+
+    elapsed_days = np.asarray((dates - dates[0]).days, dtype=float)
+    # Without option legs and an explicit schedule there is nothing to roll
+    cycle = np.zeros(n, dtype=np.int64) if roll_days is None else (elapsed_days // roll_days).astype(np.int64)
+    roll = np.r_[False, np.diff(cycle) != 0]
+    # First trading day of each roll cycle, indexed by the cycle each day belongs to
+    entry_index = np.maximum.accumulate(np.where(np.r_[True, roll[1:]], np.arange(n), 0))
+
+    def mark(entry):
+        scale = close[entry] if relative_strikes else np.ones(n)
+        time_elapsed = (elapsed_days - elapsed_days[entry]) / 365
+        r_col = np.reshape(r, (-1, 1)) if np.ndim(r) else r
+        vol_col = np.reshape(volatility, (-1, 1)) if np.ndim(volatility) else volatility
+        spot = (close / scale)[:, np.newaxis]
+        prices = portfolio.leg_values(spot, r_col, vol_col, time_elapsed)['Price']
+
+        # An option settles at intrinsic on the last trading date on or before its expiry and
+        # is then held flat until the roll, rather than tracking later spots
+        expiry_day = elapsed_days[entry][:, np.newaxis] + portfolio.expiry * 365
+        settle = np.searchsorted(elapsed_days, expiry_day, side='right') - 1
+        settled = ((np.arange(n)[:, np.newaxis] >= settle) & (portfolio.kind != STOCK)
+                   & ((settle < n - 1) | (elapsed_days[-1] >= expiry_day)))
+        if settled.any():
+            # The settlement date is in the same roll cycle, so it shares this day's scale
+            settle_spot = close[settle] / scale[:, np.newaxis]
+            intrinsic = np.maximum(np.where(portfolio.kind == CALL, settle_spot - portfolio.strike,
+                                            portfolio.strike - settle_spot), 0)
+            prices = np.where(settled, intrinsic, prices)
+
+        value = portfolio._aggregate(prices)
+        return value * scale[:, np.newaxis], time_elapsed
+
+    # Value of the position held at each close, after any roll that day
+    value, time_elapsed = mark(entry_index)
+
+    # Value at each close of the position carried in from the previous day; it only differs
+    # from `value` on roll dates, where the old position is closed out
+    carried = value.copy()
+    if roll.any():
+        previous_entry = np.r_[0, entry_index[:-1]]
+        carried_on_roll, _ = mark(previous_entry)
+        carried[roll] = carried_on_roll[roll]
+
+    position_pnl = np.zeros_like(value)
+    position_pnl[1:] = carried[1:] - value[:-1]
+
+    return {
+        'value': value,
+        'pnl': position_pnl.sum(axis=1),
+        'position_pnl': position_pnl,
+        'time_to_expiry': np.maximum(portfolio.expiry.max() - time_elapsed, 0),
+        'volatility': np.broadcast_to(volatility, n).astype(float),
+        'roll': roll,
+    }
+
+
+def _full_history(stock_data):
+    # Accept both a date-indexed frame and the reset-index frame returned by get_stock_data
+    if 'Date' in stock_data.columns and not isinstance(stock_data.index, pd.DatetimeIndex):
+        stock_data = stock_data.set_index('Date')
+    dates = pd.to_datetime(stock_data.index)
+    close = stock_data['Close'].to_numpy(dtype=float).reshape(len(stock_data), -1)[:, 0]
+    return dates, close
+
+
+def _window(dates, start_date, end_date):
+    return (dates >= pd.to_datetime(start_date)) & (dates <= pd.to_datetime(end_date))
+
+
+def _price_history(stock_data, start_date, end_date):
+    dates, close = _full_history(stock_data)
+    mask = _window(dates, start_date, end_date)
+    return dates[mask], close[mask]
+
+
+def _window_volatility(stock_data, start_date, end_date, volatility):
+    # 'realized' is estimated on the full history, so the first days of the window use
+    # trailing returns from before start_date instead of a handful of in-window returns
+    if not (isinstance(volatility, str) and volatility == 'realized'):
+        return volatility
+    dates, close = _full_history(stock_data)
+    return realized_volatility(close)[_window(dates, start_date, end_date)]
+
+
+def backtest_strategy(stock_data, portfolio, start_date, end_date, r=0.05, volatility=0.2, roll_days=None,
+                      relative_strikes=False):
+    """
+    Backtests a multi-leg Portfolio over historical stock data.
+
+    Parameters:
+        stock_data (pd.DataFrame): OHLCV data for the stock, indexed by date or with a 'Date' column
+        portfolio (Portfolio): Legs to hold, with expiries as tenors in years
+        start_date (str): The start date for the backtest
+        end_date (str): The end date for the backtest
+        r, volatility, roll_days, relative_strikes: See backtest_portfolio
+
+    Returns:
+        pd.DataFrame: Daily underlying price, position value, P&L, time to expiry and volatility.
+    """
+    dates, close = _price_history(stock_data, start_date, end_date)
+    volatility = _window_volatility(stock_data, start_date, end_date, volatility)
+    result = backtest_portfolio(dates, close, portfolio, r, volatility, roll_days, relative_strikes)
+
+    result_df = pd.DataFrame({
+        'Date': dates,
+        'Underlying': close,
+        'Option Price': result['value'].sum(axis=1),
+        'PnL': result['pnl'],
+        'Cumulative PnL': np.cumsum(result['pnl']),
+        'Time to Expiry': result['time_to_expiry'],
+        'Volatility': result['volatility'],
+        'Roll': result['roll'],
+    })
+    result_df.set_index('Date', inplace=True)
+
+    return result_df
+
+
+def backtest_strategy_with_legs(stock_data, strike_price, option_type, position_type, start_date, end_date,
+                                T=1.0, r=0.05, volatility=0.2, roll_days=None):
     """
     Backtests an option strategy with legs (long/short call/put) over a given stock price data.
-    
+
     Parameters:
         stock_data (pd.DataFrame): OHLCV data for the stock
         strike_price (float): The strike price for the option
@@ -14,28 +222,15 @@ def backtest_strategy_with_legs(stock_data, strike_price, option_type, position_
         position_type (str): 'long' or 'short'
         start_date (str): The start date for the backtest
         end_date (str): The end date for the backtest
-    
+        T (float): Time to expiry in years when the option is opened (and on each roll)
+        r, volatility, roll_days: See backtest_portfolio
+
     Returns:
         pd.DataFrame: A DataFrame containing backtested option prices.
     """
-    # Filter stock data for the given date range
-    filtered_data = stock_data[(stock_data.index >= start_date) & (stock_data.index <= end_date)]
-    
-    # Generate option prices using a simple model, assuming Black-Scholes for simplicity
-    option_prices = []
-    for index, row in filtered_data.iterrows():
-        stock_price = row['Close']
-        # Simulate option price (this can be more complex based on real models)
-        intrinsic_value = max(0, stock_price - strike_price) if option_type == 'call' else max(0, strike_price - stock_price)
-        if position_type == 'short':
-            intrinsic_value = -intrinsic_value  # Short position reverses gains/losses
-        option_prices.append(intrinsic_value)
-    
-    # Create a DataFrame for the backtested results
-    result_df = pd.DataFrame({
-        'Date': filtered_data.index,
-        'Option Price': option_prices
-    })
-    result_df.set_index('Date', inplace=True)
-    
-    return result_df
+    if position_type not in ('long', 'short'):
+        raise ValueError("Invalid position type. Choose 'long' or 'short'.")
+    quantity = 1 if position_type == 'long' else -1  # Short position reverses gains/losses
+    portfolio = Portfolio.from_legs([(option_type, strike_price, T, quantity)])
+
+    return backtest_strategy(stock_data, portfolio, start_date, end_date, r, volatility, roll_days)
@@ -0,0 +1,270 @@
+"""
+Benchmark suite for the pricing, Greeks, strategy and backtest code.
+
+Run from the repository root:
+
+    python -m src.benchmark                      # full suite, results saved under .benchmarks/
+    python -m src.benchmark --filter black --max-size 10000
+    python -m src.benchmark --compare <commit or results file>
+
+Each case is timed at several input sizes (best of a few repeats) and run once more under
+tracemalloc to record peak memory. Results are written to .benchmarks/<commit>.json
+(<commit>-dirty.json when there are uncommitted changes) so runs from different commits
+can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.option_pricer import black_scholes
+from src.greeks import option_greeks
+from src.strategies import single_leg_strategy, multi_leg_strategy
+from src.backtest_utils import backtest_strategy_with_legs
+
+RESULTS_DIR = '.benchmarks'
+CONTRACT_SIZES = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000)
+DAY_SIZES = (10, 100, 1_000, 10_000, 100_000)
+STRATEGY_SIZES = (1, 10, 100)
+GRID_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def _random_book(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'S': rng.uniform(50, 150, size),
+        'K': rng.uniform(50, 150, size),
+        'T': rng.uniform(0.05, 3.0, size),
+        'r': rng.uniform(0.0, 0.08, size),
+        'sigma': rng.uniform(0.05, 1.0, size),
+        'option_type': rng.random(size) < 0.5,
+    }
+
+
+def _synthetic_prices(days, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    # Starts early enough that the largest size (100,000 days, to 1973) stays inside the
+    # nanosecond Timestamp range of 1677-09-21 to 2262-04-11
+    index = pd.date_range('1700-01-01', periods=days, freq='D')
+    return pd.DataFrame({'Close': close}, index=index)
+
+
+def _bench_black_scholes(size):
+    book = _random_book(size)
+    return lambda: black_scholes(**book)
+
+
+def _bench_option_greeks(size):
+    book = _random_book(size)
+    return lambda: option_greeks(**book)
+
+
+def _bench_single_leg_strategy(size):
+    def run():
+        for _ in range(size):
+            single_leg_strategy(100, 100, 1, 0.05, 0.2, 'call', 'long_call')
+    return run
+
+
+def _bench_multi_leg_strategy(size):
+    def run():
+        for _ in range(size):
+            multi_leg_strategy(100, 90, 95, 105, 110, 1, 0.05, 0.2, 'iron_condor')
+    return run
+
+
+def _bench_single_leg_strategy_grid(size):
+    return lambda: single_leg_strategy(100, 100, 1, 0.05, 0.2, 'call', 'covered_call', grid_points=size)
+
+
+def _bench_multi_leg_strategy_grid(size):
+    return lambda: multi_leg_strategy(100, 90, 95, 105, 110, 1, 0.05, 0.2, 'iron_condor', grid_points=size)
+
+
+def _bench_backtest(size):
+    stock_data = _synthetic_prices(size)
+    start, end = stock_data.index[0], stock_data.index[-1]
+    return lambda: backtest_strategy_with_legs(stock_data, 100, 'call', 'long', start, end)
+
+
+# name -> (setup(size) returning a zero-argument callable, sizes, unit of size)
+BENCHMARKS = {
+    'black_scholes': (_bench_black_scholes, CONTRACT_SIZES, 'contracts'),
+    'option_greeks': (_bench_option_greeks, CONTRACT_SIZES, 'contracts'),
+    'single_leg_strategy': (_bench_single_leg_strategy, STRATEGY_SIZES, 'strategies'),
+    'multi_leg_strategy': (_bench_multi_leg_strategy, STRATEGY_SIZES, 'strategies'),
+    'single_leg_strategy_grid': (_bench_single_leg_strategy_grid, GRID_SIZES, 'points'),
+    'multi_leg_strategy_grid': (_bench_multi_leg_strategy_grid, GRID_SIZES, 'points'),
+    'backtest_strategy_with_legs': (_bench_backtest, DAY_SIZES, 'days'),
+}
+
+
+def time_callable(func, repeat=5, min_time=0.2):
+    """
+    Returns the best per-call wall time of func in seconds.
+
+    Calls are batched into loops long enough to be measured reliably, and the best of
+    `repeat` loops is reported.
+    """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    number = max(1, int(min_time / max(elapsed, 1e-9) / repeat))
+
+    best = elapsed
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def peak_memory(func):
+    """Returns the peak traced memory in bytes allocated during one call of func."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(names=None, max_size=None, repeat=5, min_time=0.2, stream=sys.stdout):
+    """
+    Runs the selected benchmarks and returns one record per (benchmark, size).
+
+    Parameters:
+    names (iterable of str, optional): Benchmarks to run; defaults to all of BENCHMARKS.
+    max_size (int, optional): Skip sizes above this.
+    repeat (int): Timing repeats per size.
+    min_time (float): Approximate seconds spent timing each size.
+    stream (file, optional): Where to print progress, or None.
+
+    Returns:
+    list of dict: name, size, unit, seconds, throughput (size per second), peak_bytes.
+    """
+    records = []
+    for name in names or BENCHMARKS:
+        setup, sizes, unit = BENCHMARKS[name]
+        for size in sizes:
+            if max_size is not None and size > max_size:
+                continue
+            func = setup(size)
+            seconds = time_callable(func, repeat=repeat, min_time=min_time)
+            record = {
+                'name': name,
+                'size': size,
+                'unit': unit,
+                'seconds': seconds,
+                'throughput': size / seconds,
+                'peak_bytes': peak_memory(func),
+            }
+            records.append(record)
+            if stream is not None:
+                print(f"{name:<32}{size:>10} {unit:<10}{seconds * 1e3:>12.3f} ms"
+                      f"{record['throughput']:>16.0f} {unit}/s{record['peak_bytes'] / 2 ** 20:>10.2f} MiB",
+                      file=stream)
+    return records
+
+
+def _git_commit():
+    # Runs with uncommitted changes are tagged <commit>-dirty so they never overwrite the
+    # results of the clean commit
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        changes = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                                 text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{commit}-dirty' if changes else commit
+
+
+def save_results(records, results_dir=RESULTS_DIR, commit=None):
+    """Writes records with machine metadata to <results_dir>/<commit>.json and returns the path."""
+    commit = commit or _git_commit()
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f'{commit}.json')
+    payload = {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'results': records,
+    }
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def load_results(ref, results_dir=RESULTS_DIR):
+    """Loads saved results from a file path or a commit id under results_dir."""
+    path = ref if os.path.exists(ref) else os.path.join(results_dir, f'{ref}.json')
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare_results(baseline, current, threshold=1.1, stream=sys.stdout):
+    """
+    Prints time ratios (current / baseline) for matching benchmarks and sizes.
+
+    Returns:
+    list of tuple: (name, size, ratio) entries slower than `threshold`.
+    """
+    base = {(r['name'], r['size']): r for r in baseline}
+    regressions = []
+    for record in current:
+        key = (record['name'], record['size'])
+        if key not in base:
+            continue
+        ratio = record['seconds'] / base[key]['seconds']
+        flag = ''
+        if ratio > threshold:
+            flag = '  REGRESSION'
+            regressions.append((record['name'], record['size'], ratio))
+        print(f"{record['name']:<32}{record['size']:>10}{ratio:>10.2f}x{flag}", file=stream)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--filter', default='', help='Only run benchmarks whose name contains this')
+    parser.add_argument('--max-size', type=int, default=None, help='Skip sizes above this')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2)
+    parser.add_argument('--results-dir', default=RESULTS_DIR)
+    parser.add_argument('--compare', default=None, help='Commit id or results file to compare against')
+    parser.add_argument('--no-save', action='store_true')
+    args = parser.parse_args(argv)
+
+    # Load the baseline first: saving this run may write to the same file
+    baseline = None
+    if args.compare:
+        try:
+            baseline = load_results(args.compare, args.results_dir)
+        except OSError:
+            parser.error(f"No saved results for '{args.compare}' in {args.results_dir}.")
+    names = [name for name in BENCHMARKS if args.filter in name]
+    records = run_benchmarks(names, max_size=args.max_size, repeat=args.repeat, min_time=args.min_time)
+    if not args.no_save:
+        print(f"Saved {save_results(records, args.results_dir)}")
+    if baseline is not None:
+        regressions = compare_results(baseline, records)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Bulk loading of many tickers into a memory-mapped columnar store.
+
+load_universe fetches tickers in groups, one many-ticker download per group (yfinance
+downloads a group's tickers on its own threads), and keeps only the requested fields of each
+frame as NumPy arrays. It then writes one (tickers x dates) matrix per field to disk.
+ColumnarStore opens those matrices with mmap_mode='r', so a backtest over thousands of
+symbols only pages in the rows it touches.
+
+Store layout:
+    meta.json        tickers, fields and tickers that failed to load
+    dates.npy        union of trading dates, datetime64[D]
+    <field>.npy      float64 matrix of shape (n_tickers, n_dates), NaN where a ticker has no data
+"""
+import json
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from src.data import default_cache
+
+
+def load_universe(tickers, start, end, store_dir, cache=None, max_concurrency=8, fields=('Close',),
+                  progress=None, group_size=100):
+    """
+    Fetches many tickers in concurrent groups and writes them to a columnar store.
+
+    Parameters:
+    tickers (iterable of str): Symbols to load; duplicates are ignored.
+    start, end (str): Date range [start, end).
+    store_dir (str): Directory for the store; existing store files are replaced.
+    cache (PriceCache, optional): Source of the data; defaults to default_cache().
+    max_concurrency (int): Maximum number of groups being loaded at once. With the default
+        cache, Yahoo downloads run one group at a time, each fetching its tickers
+        concurrently, while other groups read and write the cache.
+    fields (tuple of str): Columns to keep, e.g. ('Close',) or ('Close', 'Volume').
+    progress (callable, optional): Called as progress(done, total) after each ticker.
+    group_size (int): Tickers fetched by one PriceCache.get_many call.
+
+    Returns:
+    ColumnarStore: The store, opened memory-mapped.
+    """
+    cache = cache or default_cache()
+    tickers = list(dict.fromkeys(tickers))
+    series = {}
+    failed = []
+
+    def columns(frame):
+        if not len(frame):
+            raise ValueError("no data in the requested range")
+        # Keep only the needed columns as arrays so full frames are released immediately
+        dates = frame.index.values.astype('datetime64[D]')
+        return dates, {field: frame[field].to_numpy(dtype=np.float64).reshape(len(frame), -1)[:, 0]
+                       for field in fields}
+
+    def fetch(group):
+        try:
+            frames = cache.get_many(group, start, end)
+        except Exception as exc:  # A failed group download fails its tickers, not the load
+            return {ticker: exc for ticker in group}
+        results = {}
+        for ticker, frame in frames.items():
+            try:
+                if isinstance(frame, Exception):
+                    raise frame
+                results[ticker] = columns(frame)
+            except Exception as exc:  # One bad symbol should not abort a universe load
+                results[ticker] = exc
+        return results
+
+    # The cache index is written once for the whole universe rather than after every group
+    groups = [tickers[i:i + group_size] for i in range(0, len(tickers), group_size)]
+    done = 0
+    with cache.batch(), ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+        for future in as_completed([pool.submit(fetch, group) for group in groups]):
+            for ticker, result in future.result().items():
+                if isinstance(result, Exception):
+                    warnings.warn(f"Failed to load {ticker}: {result}")
+                    failed.append(ticker)
+                else:
+                    series[ticker] = result
+                done += 1
+                if progress is not None:
+                    progress(done, len(tickers))
+
+    loaded = [ticker for ticker in tickers if ticker in series]
+    all_dates = np.unique(np.concatenate([series[t][0] for t in loaded])) if loaded \
+        else np.empty(0, dtype='datetime64[D]')
+
+    os.makedirs(store_dir, exist_ok=True)
+    np.save(os.path.join(store_dir, 'dates.npy'), all_dates)
+    for field in fields:
+        matrix = np.lib.format.open_memmap(os.path.join(store_dir, f'{field}.npy'), mode='w+',
+                                           dtype=np.float64, shape=(len(loaded), all_dates.size))
+        matrix[:] = np.nan
+        for row, ticker in enumerate(loaded):
+            dates, values = series[ticker]
+            matrix[row, np.searchsorted(all_dates, dates)] = values[field]
+        matrix.flush()
+        del matrix
+
+    with open(os.path.join(store_dir, 'meta.json'), 'w') as f:
+        json.dump({'tickers': loaded, 'fields': list(fields), 'failed': failed}, f)
+
+    return ColumnarStore(store_dir)
+
+
+class ColumnarStore:
+    """
+    Read-only view of a store written by load_universe.
+
+    Field matrices are memory-mapped, so rows are read from disk on demand and shared
+    between processes through the page cache.
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        with open(os.path.join(store_dir, 'meta.json')) as f:
+            meta = json.load(f)
+        self.tickers = meta['tickers']
+        self.fields = meta['fields']
+        self.failed = meta['failed']
+        self.dates = np.load(os.path.join(store_dir, 'dates.npy'))
+        self._rows = {ticker: row for row, ticker in enumerate(self.tickers)}
+        self._matrices = {}
+
+    def matrix(self, field='Close'):
+        """Memory-mapped (n_tickers, n_dates) matrix of a field."""
+        if field not in self._matrices:
+            if field not in self.fields:
+                raise KeyError(f"Field '{field}' is not in the store. Available: {self.fields}.")
+            self._matrices[field] = np.load(os.path.join(self.store_dir, f'{field}.npy'), mmap_mode='r')
+        return self._matrices[field]
+
+    def row(self, ticker, field='Close'):
+        """Memory-mapped series of one ticker over all store dates (NaN where missing)."""
+        return self.matrix(field)[self._rows[ticker]]
+
+    def close(self, ticker):
+        return self.row(ticker, 'Close')
+
+    def frame(self, ticker, start=None, end=None):
+        """
+        One ticker's history over [start, end) as a DataFrame indexed by 'Date', dropping
+        dates with no data. This copies the selected rows, like get_stock_data's output.
+        """
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start), 'D'))
+        hi = self.dates.size if end is None else np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end), 'D'))
+        frame = pd.DataFrame({field: self.row(ticker, field)[lo:hi] for field in self.fields},
+                             index=pd.DatetimeIndex(self.dates[lo:hi], name='Date'))
+        return frame.dropna(how='all')
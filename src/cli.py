@@ -0,0 +1,184 @@
+"""
+Headless batch pricing of option contracts from a CSV or Parquet file.
+
+Run from the repository root:
+
+    python -m src.cli contracts.csv priced.parquet
+    python -m src.cli contracts.parquet - --outputs Price,Delta,Vega --rate 0.04
+    python -m src.cli contracts.csv priced.csv --model lattice --steps 200
+
+Input columns (renamed with --columns, e.g. --columns S=spot,K=strike):
+    S, K, T, sigma     spot, strike, time to expiry (years) and volatility
+    r                  risk-free rate (optional, defaults to --rate)
+    option_type        'call' or 'put' (optional, defaults to --option-type)
+
+Contracts are read, priced and written in chunks of --chunk-size rows, so memory is bounded
+by one chunk whatever the file size. Only argparse is imported up front; NumPy, PyArrow and
+the pricing modules are imported once there is work to do, and Streamlit and the plotting
+libraries are never imported.
+"""
+import argparse
+import os
+import sys
+import time
+
+MODELS = ('black-scholes', 'lattice')
+INPUT_COLUMNS = ('S', 'K', 'T', 'r', 'sigma', 'option_type')
+
+
+def _parse_columns(mapping):
+    # "S=spot,K=strike" -> {'S': 'spot', 'K': 'strike'}
+    columns = {name: name for name in INPUT_COLUMNS}
+    for item in filter(None, (mapping or '').split(',')):
+        name, _, source = item.partition('=')
+        if name not in columns or not source:
+            raise ValueError(f"Invalid column mapping '{item}'. Use NAME=column with NAME in {INPUT_COLUMNS}.")
+        columns[name] = source
+    return columns
+
+
+def _file_format(path):
+    if path == '-' or path.lower().endswith('.csv'):
+        return 'csv'
+    if path.lower().endswith(('.parquet', '.pq')):
+        return 'parquet'
+    raise ValueError(f"Cannot tell the format of '{path}'. Use a .csv or .parquet file.")
+
+
+def read_batches(path, chunk_size):
+    """Yields pyarrow RecordBatches of at most chunk_size rows from a CSV or Parquet file."""
+    if _file_format(path) == 'parquet':
+        import pyarrow.parquet as pq
+        yield from pq.ParquetFile(path).iter_batches(batch_size=chunk_size)
+        return
+
+    import pyarrow.csv as pv
+    reader = pv.open_csv(sys.stdin.buffer if path == '-' else path,
+                         read_options=pv.ReadOptions(block_size=1 << 22))
+    for batch in reader:
+        for start in range(0, batch.num_rows, chunk_size):
+            yield batch.slice(start, chunk_size)
+
+
+def price_batch(batch, columns, outputs, model='black-scholes', rate=0.05, option_type='call', n_steps=200,
+                american=True):
+    """
+    Prices one RecordBatch of contracts.
+
+    Parameters:
+    batch (pyarrow.RecordBatch): Contracts.
+    columns (dict): Input name -> column name in the batch, see INPUT_COLUMNS.
+    outputs (tuple of str): Names from KERNEL_OUTPUTS.
+    model (str): 'black-scholes' (closed form) or 'lattice' (smoothed binomial lattice, Greeks
+        by finite differences).
+    rate (float): Risk-free rate when the batch has no rate column.
+    option_type (str): Option type when the batch has no option type column.
+    n_steps (int): Lattice time steps.
+    american (bool): Allow early exercise on the lattice.
+
+    Returns:
+    pyarrow.RecordBatch: The input columns followed by one float column per output.
+    """
+    import numpy as np
+    import pyarrow as pa
+
+    names = batch.schema.names
+
+    def column(name, default=None):
+        if columns[name] not in names:
+            if default is None:
+                raise ValueError(f"Input is missing column '{columns[name]}'.")
+            return default
+        values = batch.column(columns[name]).to_numpy(zero_copy_only=False)
+        return values if name == 'option_type' else values.astype(float)
+
+    S, K, T, sigma = (column(name) for name in ('S', 'K', 'T', 'sigma'))
+    r = column('r', rate)
+    flags = column('option_type', option_type)
+
+    if model == 'black-scholes':
+        from src.option_pricer import bs_kernel
+        results = bs_kernel(S, K, T, r, sigma, flags, outputs)
+    else:
+        from src.fd_greeks import finite_difference_greeks
+        from src.lattice import lattice_price
+        # The smoothed lattice is differentiable in S; a plain tree's nodes are further apart
+        # than the 1% S bump, so second differences would land on its kinks
+        results = finite_difference_greeks(lattice_price, S, K, T, r, sigma, flags, outputs=outputs,
+                                           n_steps=n_steps, american=american, smooth=True)
+
+    arrays = batch.columns + [pa.array(np.broadcast_to(results[name], (batch.num_rows,))) for name in outputs]
+    return pa.RecordBatch.from_arrays(arrays, names=names + list(outputs))
+
+
+class _Writer:
+    # Opens the CSV or Parquet writer on the first batch, once the output schema is known
+    def __init__(self, path):
+        self.path = path
+        self.format = _file_format(path)
+        self._writer = None
+
+    def write(self, batch):
+        if self._writer is None:
+            if self.format == 'parquet':
+                import pyarrow.parquet as pq
+                self._writer = pq.ParquetWriter(self.path, batch.schema)
+            else:
+                import pyarrow.csv as pv
+                self._writer = pv.CSVWriter(sys.stdout.buffer if self.path == '-' else self.path, batch.schema)
+        self._writer.write_batch(batch)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('input', help="Contracts as .csv or .parquet ('-' reads CSV from stdin)")
+    parser.add_argument('output', help="Results as .csv or .parquet ('-' writes CSV to stdout)")
+    parser.add_argument('--outputs', default='Price,Delta,Gamma,Vega,Theta,Rho',
+                        help='Comma-separated price and Greeks to compute')
+    parser.add_argument('--model', choices=MODELS, default='black-scholes')
+    parser.add_argument('--steps', type=int, default=200, help='Lattice time steps')
+    parser.add_argument('--european', action='store_true', help='No early exercise on the lattice')
+    parser.add_argument('--rate', type=float, default=0.05, help='Risk-free rate if there is no r column')
+    parser.add_argument('--option-type', choices=('call', 'put'), default='call',
+                        help='Option type if there is no option_type column')
+    parser.add_argument('--columns', default=None, help='Input column names, e.g. S=spot,K=strike')
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--quiet', action='store_true')
+    args = parser.parse_args(argv)
+
+    outputs = tuple(name.strip() for name in args.outputs.split(',') if name.strip())
+    try:
+        columns = _parse_columns(args.columns)
+        _file_format(args.input)
+        if args.input != '-' and not os.path.isfile(args.input):
+            raise ValueError(f"Input file '{args.input}' does not exist.")
+        writer = _Writer(args.output)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    start = time.perf_counter()
+    rows = 0
+    try:
+        for batch in read_batches(args.input, args.chunk_size):
+            writer.write(price_batch(batch, columns, outputs, model=args.model, rate=args.rate,
+                                     option_type=args.option_type, n_steps=args.steps,
+                                     american=not args.european))
+            rows += batch.num_rows
+            if not args.quiet:
+                print(f"\rPriced {rows:,} contracts", end='', file=sys.stderr)
+    except (ValueError, OSError) as exc:
+        parser.error(str(exc))
+    finally:
+        writer.close()
+
+    if not args.quiet:
+        print(f"\rPriced {rows:,} contracts in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,373 @@
-import yfinance as yf
+import contextlib
+import json
+import os
+import threading
+import time
+
 import pandas as pd
 
-def get_stock_data(ticker, start, end):
+DEFAULT_CACHE_DIR = os.environ.get(
+    'BSTOOL_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'blackscholes_tool'))
+DEFAULT_CACHE_BYTES = 512 * 2 ** 20
+
+
+def _normalize(data):
+    # Recent yfinance versions return (field, ticker) columns even for a single ticker
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.copy()
+        data.columns = data.columns.get_level_values(0)
+    data.index = pd.to_datetime(data.index)
+    data.index.name = 'Date'
+    return data
+
+
+# yfinance reports a range without trading days (weekends, holidays, before a listing) as an
+# error too; those are successful empty fetches, not failures. Errors are read from the
+# private yf.shared._ERRORS, present from 0.2.26 on; without it failures look like empty ranges
+_NO_ROWS_MESSAGES = ('no price data found', 'no data found for this date range')
+
+# yf.download keeps its errors in module-global state (shared._ERRORS, and shared._DFS for the
+# results in the yfinance versions requirements.txt allows), so concurrent calls overwrite
+# each other. Calls are serialized; a multi-ticker call downloads its tickers on yfinance's
+# own threads, which is how many tickers are fetched concurrently
+_yahoo_lock = threading.Lock()
+
+
+def yahoo_many_fetcher(tickers, start, end):
+    """
+    Downloads daily history for [start, end) of several tickers in one yf.download call.
+
+    Returns:
+    dict: Ticker -> date-indexed DataFrame, or the RuntimeError raised for a ticker that
+        yfinance reports an error for (rate limit, network failure, unknown symbol), so that
+        callers do not mistake a failed download for an empty range.
+    """
+    import yfinance as yf
+    tickers = list(tickers)
+    with _yahoo_lock:
+        data = yf.download(tickers, start=start, end=end, progress=False, threads=True, group_by='ticker')
+        errors = dict(getattr(yf.shared, '_ERRORS', {}))
+
+    results = {}
+    for ticker in tickers:
+        error = errors.get(ticker.upper())
+        if error is not None and not any(message in str(error).lower() for message in _NO_ROWS_MESSAGES):
+            results[ticker] = RuntimeError(f"Failed to download {ticker} for {start} to {end}: {error}")
+            continue
+        if not isinstance(data.columns, pd.MultiIndex):
+            # Older yfinance returns flat columns for a single ticker
+            frame = data
+        elif ticker.upper() in data.columns.get_level_values(0):
+            frame = data[ticker.upper()]
+        else:
+            frame = pd.DataFrame(index=data.index[:0])
+        # Dates are the union over the group, so drop the ones this ticker did not trade on
+        results[ticker] = _normalize(frame.dropna(how='all'))
+    return results
+
+
+def yahoo_fetcher(ticker, start, end):
+    """
+    Downloads daily history for [start, end) from Yahoo Finance, indexed by date.
+
+    Raises:
+    RuntimeError: If yfinance reports an error for the ticker (see yahoo_many_fetcher).
+    """
+    result = yahoo_many_fetcher([ticker], start, end)[ticker]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def fetch_each(fetcher):
+    """
+    Builds a many-ticker fetcher from a single-ticker one, calling it once per ticker and
+    returning the exception it raised for any ticker that failed.
+    """
+    def fetch_many(tickers, start, end):
+        results = {}
+        for ticker in tickers:
+            try:
+                results[ticker] = fetcher(ticker, start, end)
+            except Exception as exc:
+                results[ticker] = exc
+        return results
+
+    return fetch_many
+
+
+def csv_fetcher(path):
+    """
+    Builds a fetcher that serves history from a local CSV file instead of Yahoo.
+
+    The file needs a 'Date' column and, when it holds several symbols, a 'Ticker' column.
+    """
+    frame = pd.read_csv(path, parse_dates=['Date'])
+
+    def fetch(ticker, start, end):
+        rows = frame[frame['Ticker'] == ticker] if 'Ticker' in frame.columns else frame
+        rows = rows.set_index('Date').drop(columns='Ticker', errors='ignore').sort_index()
+        return _normalize(rows[(rows.index >= pd.Timestamp(start)) & (rows.index < pd.Timestamp(end))])
+
+    return fetch
+
+
+def _merge_ranges(ranges):
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _missing_ranges(ranges, start, end):
+    # Gaps of [start, end) not covered by the (merged, sorted) cached ranges
+    gaps = []
+    cursor = start
+    for cached_start, cached_end in ranges:
+        if cached_end <= cursor:
+            continue
+        if cached_start >= end:
+            break
+        if cached_start > cursor:
+            gaps.append((cursor, cached_start))
+        cursor = max(cursor, cached_end)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class PriceCache:
+    """
+    Persistent on-disk cache of daily price history, one Parquet file per ticker.
+
+    The cache remembers which date ranges it has fetched for each ticker, serves overlapping
+    requests from disk and only fetches the gaps. Ranges are never recorded past today, so
+    the latest days are re-fetched until they are final. A gap the fetcher returned without
+    raising is recorded even when it holds no rows (weekends, holidays, dates before a
+    listing), so it is not requested again; a fetcher raising leaves the ranges untouched.
+    When the files exceed max_bytes, the least recently used tickers are evicted.
+
+    The range index (with each file's size) is loaded once and kept in memory; it is written
+    back after every get, or once at the end of a batch(). A cache can be shared between
+    threads: each ticker has its own lock for downloads and file I/O, and the shared lock
+    only guards the in-memory index.
+
+    Parameters:
+    cache_dir (str): Directory holding the Parquet files and the range index.
+    fetcher (callable): fetcher(ticker, start, end) returning a date-indexed DataFrame for
+        [start, end), such as yahoo_fetcher or csv_fetcher(path). It must raise, rather than
+        return an empty frame, when the download fails.
+    max_bytes (int): Size limit for the cached files.
+    many_fetcher (callable, optional): many_fetcher(tickers, start, end) returning a dict of
+        frames or exceptions per ticker, used by get_many to fetch a group of tickers in one
+        call. Defaults to yahoo_many_fetcher for yahoo_fetcher, and otherwise to calling
+        fetcher once per ticker.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, fetcher=yahoo_fetcher, max_bytes=DEFAULT_CACHE_BYTES,
+                 many_fetcher=None):
+        self.cache_dir = cache_dir
+        self.fetcher = fetcher
+        if many_fetcher is None and fetcher is yahoo_fetcher:
+            many_fetcher = yahoo_many_fetcher
+        self.many_fetcher = many_fetcher
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._index_path = os.path.join(cache_dir, 'index.json')
+        self._lock = threading.Lock()
+        self._ticker_locks = {}
+        self._batch_depth = 0
+        self._index = self._load_index()
+        self._total_bytes = sum(entry['bytes'] for entry in self._index.values())
+
+    def _path(self, ticker):
+        return os.path.join(self.cache_dir, f'{ticker.upper()}.parquet')
+
+    def _load_index(self):
+        try:
+            with open(self._index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        for key, entry in index.items():
+            if 'bytes' not in entry:  # Indexes written before sizes were tracked
+                path = self._path(key)
+                entry['bytes'] = os.path.getsize(path) if os.path.exists(path) else 0
+        return index
+
+    def _save_index(self):
+        # Called with the lock held. Write then rename so readers never see a partial file
+        if self._batch_depth:
+            return
+        tmp_path = f'{self._index_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Defers index writes until the block exits, for loading many tickers at once."""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                self._save_index()
+
+    def _ticker_lock(self, key):
+        with self._lock:
+            return self._ticker_locks.setdefault(key, threading.Lock())
+
+    def _read(self, ticker):
+        # None when the file is missing or unreadable
+        try:
+            return pd.read_parquet(self._path(ticker))
+        except (OSError, ValueError):
+            return None
+
+    def get(self, ticker, start, end):
+        """
+        Returns daily history for [start, end), fetching only the dates not already cached.
+
+        Returns:
+        DataFrame: Price history indexed by 'Date'.
+        """
+        result = self.get_many([ticker], start, end)[ticker]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def get_many(self, tickers, start, end):
+        """
+        Returns daily history for [start, end) of several tickers, fetching the dates not
+        already cached with one many_fetcher call per distinct gap.
+
+        Returns:
+        dict: Ticker -> DataFrame indexed by 'Date', or the exception raised while fetching
+            that ticker, in which case nothing is recorded for it.
+        """
+        start = pd.Timestamp(start).strftime('%Y-%m-%d')
+        end = pd.Timestamp(end).strftime('%Y-%m-%d')
+        keys = {ticker: ticker.upper() for ticker in dict.fromkeys(tickers)}
+        fetch_many = self.many_fetcher or fetch_each(self.fetcher)
+
+        # Ticker locks are taken in a fixed order so overlapping groups cannot deadlock
+        locks = [self._ticker_lock(key) for key in sorted(set(keys.values()))]
+        with contextlib.ExitStack() as stack:
+            for lock in locks:
+                stack.enter_context(lock)
+
+            cached, gaps = {}, {}
+            for ticker, key in keys.items():
+                cached[ticker] = self._read(key)
+                with self._lock:
+                    entry = self._index.get(key)
+                    if entry is not None and cached[ticker] is None:
+                        # The file was evicted (by another cache on the same directory), deleted
+                        # or corrupted, so its ranges are no longer cached and must be refetched
+                        self._total_bytes -= entry['bytes']
+                        entry['ranges'], entry['bytes'] = [], 0
+                    ranges = list(entry['ranges']) if entry is not None else []
+                gaps[ticker] = _missing_ranges(ranges, start, end)
+
+            # Tickers missing the same range are fetched together
+            groups = {}
+            for ticker, ticker_gaps in gaps.items():
+                for gap in ticker_gaps:
+                    groups.setdefault(gap, []).append(ticker)
+            fetched = {ticker: [] for ticker in keys}
+            for (gap_start, gap_end), group in groups.items():
+                for ticker, frame in fetch_many(group, gap_start, gap_end).items():
+                    fetched[ticker].append(frame)
+
+            results = {}
+            for ticker, key in keys.items():
+                failure = next((frame for frame in fetched[ticker] if isinstance(frame, Exception)), None)
+                if failure is not None:
+                    results[ticker] = failure
+                    continue
+                data = self._store(key, cached[ticker], gaps[ticker], fetched[ticker])
+                if data is None:
+                    results[ticker] = pd.DataFrame(index=pd.DatetimeIndex([], name='Date'))
+                else:
+                    results[ticker] = data[(data.index >= pd.Timestamp(start)) & (data.index < pd.Timestamp(end))]
+
+            with self._lock:
+                self._evict(keep=set(keys.values()))
+                self._save_index()
+
+        return results
+
+    def _store(self, key, cached, gaps, fetched):
+        # Called with the ticker lock held: merges fetched frames into the file and records the gaps
+        size = None
+        frames = [frame for frame in fetched if len(frame)]
+        if frames:
+            cached = pd.concat(([] if cached is None else [cached]) + frames)
+            cached = cached[~cached.index.duplicated(keep='last')].sort_index()
+            cached.to_parquet(self._path(key))
+            size = os.path.getsize(self._path(key))
+
+        # Fetchers raise on failure, so every fetched gap is covered, including empty ones
+        today = time.strftime('%Y-%m-%d')
+        covered = [[gap_start, min(gap_end, today)] for gap_start, gap_end in gaps if gap_start < today]
+
+        with self._lock:
+            entry = self._index.setdefault(key, {'ranges': [], 'bytes': 0})
+            entry['ranges'] = _merge_ranges(entry['ranges'] + covered)
+            if size is not None:
+                self._total_bytes += size - entry['bytes']
+                entry['bytes'] = size
+            entry['last_access'] = time.time()
+        return cached
+
+    def size(self):
+        """Total bytes of cached Parquet files."""
+        with self._lock:
+            return self._total_bytes
+
+    def _evict(self, keep=()):
+        # Called with the lock held; tickers being read or written by another thread are skipped
+        if self._total_bytes <= self.max_bytes:
+            return
+        for key in sorted(self._index, key=lambda k: self._index[k].get('last_access', 0)):
+            if self._total_bytes <= self.max_bytes:
+                break
+            lock = self._ticker_locks.get(key)
+            if key in keep or (lock is not None and lock.locked()):
+                continue
+            if os.path.exists(self._path(key)):
+                os.remove(self._path(key))
+            self._total_bytes -= self._index.pop(key)['bytes']
+
+    def clear(self):
+        """Removes every cached file."""
+        with self._lock:
+            for key in self._index:
+                if os.path.exists(self._path(key)):
+                    os.remove(self._path(key))
+            self._index = {}
+            self._total_bytes = 0
+            self._save_index()
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Shared PriceCache in DEFAULT_CACHE_DIR backed by Yahoo Finance."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = PriceCache()
+    return _default_cache
+
+
+def get_stock_data(ticker, start, end, cache=None, use_cache=True):
     """
     Fetches historical stock data using yfinance.
 
@@ -9,10 +375,15 @@ def get_stock_data(ticker, start, end):
     ticker (str): The stock ticker symbol (e.g., 'AAPL' for Apple).
     start (str): The start date for the data (format: 'YYYY-MM-DD').
     end (str): The end date for the data (format: 'YYYY-MM-DD').
+    cache (PriceCache, optional): Cache to serve the data from; defaults to default_cache().
+    use_cache (bool): Set to False to always download.
 
     Returns:
     DataFrame: A pandas DataFrame with historical stock data.
     """
-    data = yf.download(ticker, start=start, end=end)
+    if use_cache:
+        data = (cache or default_cache()).get(ticker, start, end)
+    else:
+        data = yahoo_fetcher(ticker, start, end)
     data = data.reset_index()
     return data
@@ -0,0 +1,147 @@
+import numpy as np
+from src.option_pricer import option_flags, FIRST_ORDER_OUTPUTS, KERNEL_OUTPUTS
+
+# Bumped market states as multiples of the (S, sigma, T, r) bump sizes. T is only ever
+# bumped down, since theta and charm measure the effect of calendar time passing.
+SCENARIOS = {
+    'base': (0, 0, 0, 0),
+    'S+': (1, 0, 0, 0),
+    'S-': (-1, 0, 0, 0),
+    'sigma+': (0, 1, 0, 0),
+    'sigma-': (0, -1, 0, 0),
+    'T-': (0, 0, -1, 0),
+    'r+': (0, 0, 0, 1),
+    'r-': (0, 0, 0, -1),
+    'S+sigma+': (1, 1, 0, 0),
+    'S+sigma-': (1, -1, 0, 0),
+    'S-sigma+': (-1, 1, 0, 0),
+    'S-sigma-': (-1, -1, 0, 0),
+    'S+T-': (1, 0, -1, 0),
+    'S-T-': (-1, 0, -1, 0),
+}
+
+# Scenarios each output needs
+_REQUIRED = {
+    'Price': ('base',),
+    'Delta': ('S+', 'S-'),
+    'Gamma': ('base', 'S+', 'S-'),
+    'Vega': ('sigma+', 'sigma-'),
+    'Theta': ('base', 'T-'),
+    'Rho': ('r+', 'r-'),
+    'Vanna': ('S+sigma+', 'S+sigma-', 'S-sigma+', 'S-sigma-'),
+    'Volga': ('base', 'sigma+', 'sigma-'),
+    'Charm': ('S+', 'S-', 'S+T-', 'S-T-'),
+}
+
+DEFAULT_BUMPS = {
+    'S': 1e-2,  # Relative to S
+    'sigma': 1e-3,
+    'T': 1 / 365,
+    'r': 1e-4,
+}
+
+
+def _evaluate(pricer, S, K, T, r, sigma, flags, vectorized, pricer_kwargs):
+    if vectorized:
+        result = pricer(S, K, T, r, sigma, flags, **pricer_kwargs)
+        result = result['Price'] if isinstance(result, dict) else result
+        return np.asarray(result, dtype=float)
+
+    # Scalar pricers (e.g. monte_carlo_price) are called once per contract and scenario
+    prices = np.empty(S.size)
+    for i, args in enumerate(zip(S.ravel(), K.ravel(), T.ravel(), r.ravel(), sigma.ravel(), flags.ravel())):
+        *market, is_call = args
+        result = pricer(*market, 'call' if is_call else 'put', **pricer_kwargs)
+        prices[i] = result['Price'] if isinstance(result, dict) else result
+    return prices.reshape(S.shape)
+
+
+def finite_difference_greeks(pricer, S, K, T, r, sigma, option_type='call', outputs=FIRST_ORDER_OUTPUTS,
+                             bumps=None, vectorized=True, seed=None, **pricer_kwargs):
+    """
+    Price and Greeks of any pricing function by central finite differences.
+
+    Every bumped scenario the requested outputs need (S +- h, sigma +- h, T - h, r +- h and the
+    cross bumps for second-order Greeks) is stacked along a new leading axis and priced in one
+    batch call, instead of one call per bump.
+
+    Parameters:
+    pricer (callable): pricer(S, K, T, r, sigma, option_type, **pricer_kwargs) returning prices
+        (or a dict with 'Price'), e.g. black_scholes or lattice_price. option_type is passed as
+        a boolean call-flag array when vectorized. Lattice pricers need smooth=True (or
+        richardson=True): a plain tree's nodes are further apart than the default 1% S bump,
+        which makes Gamma, Vanna and Charm meaningless.
+    S, K, T, r, sigma (float or array-like): Market inputs, broadcast against each other.
+    option_type (str, bool or array-like): See option_flags.
+    outputs (iterable of str): Names from KERNEL_OUTPUTS. Units follow bs_kernel: Vega, Vanna
+        and Volga per 1% volatility, Theta and Charm per day, Rho per 1% rate.
+    bumps (dict, optional): Overrides for DEFAULT_BUMPS. The S bump is relative to S.
+    vectorized (bool): Whether pricer accepts arrays. Scalar pricers are looped over.
+    seed (int, optional): Passed to the pricer for every scenario, so a stochastic pricer
+        such as monte_carlo_price uses common random numbers across bumps.
+    **pricer_kwargs: Extra keyword arguments for the pricer.
+
+    Returns:
+    dict: Arrays (or scalars for scalar inputs) keyed by output name. Theta and Charm are 0
+        for contracts with T <= 0.
+    """
+    outputs = tuple(outputs)
+    unknown = set(outputs) - set(KERNEL_OUTPUTS)
+    if unknown:
+        raise ValueError(f"Unknown outputs: {sorted(unknown)}. Choose from {KERNEL_OUTPUTS}.")
+    bumps = {**DEFAULT_BUMPS, **(bumps or {})}
+    if seed is not None:
+        pricer_kwargs['seed'] = seed
+
+    S, K, T, r, sigma = (np.asarray(x, dtype=float) for x in (S, K, T, r, sigma))
+    flags = option_flags(option_type)
+    shape = np.broadcast_shapes(S.shape, K.shape, T.shape, r.shape, sigma.shape, np.shape(flags))
+    S, K, T, r, sigma, flags = (np.broadcast_to(x, shape) for x in (S, K, T, r, sigma, flags))
+
+    h_S = bumps['S'] * S
+    h_sigma = bumps['sigma']
+    # Never bump through expiry. Expired contracts are not bumped at all: their T- scenarios
+    # equal the base, and dividing by 1 instead of 0 reports Theta and Charm as 0
+    h_T = np.clip(T / 2, 0, bumps['T'])
+    dT = np.where(h_T > 0, h_T, 1.0)
+    h_r = bumps['r']
+
+    names = sorted({scenario for output in outputs for scenario in _REQUIRED[output]}, key=list(SCENARIOS).index)
+    shifts = np.array([SCENARIOS[name] for name in names], dtype=float).reshape((len(names), 4) + (1,) * len(shape))
+    stacked = _evaluate(
+        pricer,
+        S + shifts[:, 0] * h_S,
+        np.broadcast_to(K, (len(names),) + shape),
+        T + shifts[:, 2] * h_T,
+        r + shifts[:, 3] * h_r,
+        sigma + shifts[:, 1] * h_sigma,
+        np.broadcast_to(flags, (len(names),) + shape),
+        vectorized,
+        pricer_kwargs,
+    )
+    V = dict(zip(names, stacked))
+
+    greeks = {}
+    for name in outputs:
+        if name == 'Price':
+            value = V['base']
+        elif name == 'Delta':
+            value = (V['S+'] - V['S-']) / (2 * h_S)
+        elif name == 'Gamma':
+            value = (V['S+'] - 2 * V['base'] + V['S-']) / h_S ** 2
+        elif name == 'Vega':
+            value = (V['sigma+'] - V['sigma-']) / (2 * h_sigma) / 100
+        elif name == 'Theta':
+            value = (V['T-'] - V['base']) / dT / 365
+        elif name == 'Rho':
+            value = (V['r+'] - V['r-']) / (2 * h_r) / 100
+        elif name == 'Vanna':
+            value = (V['S+sigma+'] - V['S+sigma-'] - V['S-sigma+'] + V['S-sigma-']) / (4 * h_S * h_sigma) / 100
+        elif name == 'Volga':
+            value = (V['sigma+'] - 2 * V['base'] + V['sigma-']) / h_sigma ** 2 / 10000
+        else:
+            # Change in delta as one day passes
+            value = ((V['S+T-'] - V['S-T-']) - (V['S+'] - V['S-'])) / (2 * h_S * dT) / 365
+        value = np.asarray(value, dtype=float)
+        greeks[name] = value[()] if value.ndim == 0 else value
+    return greeks
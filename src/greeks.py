@@ -1,20 +1,7 @@
-import numpy as np
-from scipy.stats import norm
+from src.option_pricer import black_scholes_batch
 
-def option_greeks(S, K, T, r, sigma, option_type='call'):
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-
-    delta = norm.cdf(d1) if option_type == 'call' else norm.cdf(d1) - 1
-    gamma = norm.pdf(d1) / (S * sigma * np.sqrt(T))
-    vega = S * norm.pdf(d1) * np.sqrt(T)
-    theta = (-S * norm.pdf(d1) * sigma / (2 * np.sqrt(T))) - r * K * np.exp(-r * T) * norm.cdf(d2)
-    rho = K * T * np.exp(-r * T) * norm.cdf(d2) if option_type == 'call' else -K * T * np.exp(-r * T) * norm.cdf(-d2)
 
-    return {
-        'Delta': delta,
-        'Gamma': gamma,
-        'Vega': vega / 100,  # Vega is often reported per 1% change in volatility
-        'Theta': theta / 365,  # Theta is often reported per day
-        'Rho': rho / 100  # Rho is often reported per 1% change in interest rate
-    }
+def option_greeks(S, K, T, r, sigma, option_type='call'):
+    greeks = black_scholes_batch(S, K, T, r, sigma, option_type)
+    del greeks['Price']
+    return greeks
@@ -0,0 +1,154 @@
+import numpy as np
+from src.option_pricer import bs_kernel, option_flags
+
+# Per-contract solver status codes
+CONVERGED = 0
+MAX_ITERATIONS = 1
+OUT_OF_BOUNDS = 2  # Price outside the no-arbitrage range or the sigma search bracket
+NO_VEGA = 3  # The price cannot resolve sigma to within sigma_tol, e.g. deep in or out of the money
+
+# Relative rounding error of kernel prices. The price is the difference of two terms of
+# about |Delta| S, so errors scale with |Delta| S + price rather than with the price alone.
+# Below PRICE_FLOOR the terms approach subnormal numbers and carry no reliable digits.
+PRICE_EPS = 1e-14
+PRICE_FLOOR = 1e-290
+
+STATUS_LABELS = {
+    CONVERGED: 'converged',
+    MAX_ITERATIONS: 'max iterations',
+    OUT_OF_BOUNDS: 'out of bounds',
+    NO_VEGA: 'no vega',
+}
+
+
+def _initial_guess(S, K, T, r):
+    # Manaster-Koehler starting point, which keeps Newton well inside its convergence region
+    with np.errstate(divide='ignore', invalid='ignore'):
+        guess = np.sqrt(2 * np.abs(np.log(S / K) + r * T) / T)
+    return np.where(np.isfinite(guess) & (guess > 0), guess, 0.2)
+
+
+def implied_volatility(price, S, K, T, r, option_type='call', tol=1e-8, max_iter=100,
+                       sigma_bounds=(1e-6, 5.0), vega_floor=1e-10, sigma_tol=1e-4):
+    """
+    Solves Black-Scholes implied volatilities for a whole chain at once.
+
+    Each iteration takes a vectorized Newton step using the kernel's vega, falling back to
+    bisection of a per-contract bracket wherever vega vanishes or the Newton step leaves the
+    bracket. Only contracts that have not yet converged are repriced.
+
+    Parameters:
+    price (float or array-like): Observed option prices.
+    S, K, T, r (float or array-like): Spot, strike, time to expiry (years) and risk-free rate.
+    option_type (str, bool or array-like): See option_flags.
+    tol (float): Absolute price tolerance.
+    max_iter (int): Maximum number of iterations.
+    sigma_bounds (tuple): Lower and upper volatility bracket.
+    vega_floor (float): Vega (per unit volatility) below which bisection is used.
+    sigma_tol (float): Volatility tolerance. Results are within sigma_tol of the exact
+        implied volatility; contracts whose price cannot resolve sigma that finely are
+        reported as NO_VEGA with a NaN volatility.
+
+    Returns:
+    dict: 'Implied Volatility' (NaN where not solved), 'Status' (see STATUS_LABELS)
+        and 'Iterations' per contract.
+    """
+    price, S, K, T, r = (np.asarray(x, dtype=float) for x in (price, S, K, T, r))
+    flags = option_flags(option_type)
+    shape = np.broadcast_shapes(price.shape, S.shape, K.shape, T.shape, r.shape, np.shape(flags))
+    price, S, K, T, r, flags = (np.broadcast_to(x, shape).ravel() for x in (price, S, K, T, r, flags))
+
+    n = price.size
+    sigma = np.full(n, np.nan)
+    status = np.full(n, MAX_ITERATIONS, dtype=np.int8)
+    iterations = np.zeros(n, dtype=np.int64)
+
+    # Reject prices outside the no-arbitrage bounds or the reachable range of the bracket
+    lo_sigma, hi_sigma = sigma_bounds
+    lo_price = bs_kernel(S, K, T, r, lo_sigma, flags)['Price']
+    hi_price = bs_kernel(S, K, T, r, hi_sigma, flags)['Price']
+    invalid = ~((price >= lo_price - tol) & (price <= hi_price + tol) & (T > 0))
+    status[invalid] = OUT_OF_BOUNDS
+
+    active = np.flatnonzero(~invalid)
+    lo = np.full(active.size, float(lo_sigma))
+    hi = np.full(active.size, float(hi_sigma))
+    guess = np.clip(_initial_guess(S[active], K[active], T[active], r[active]), lo_sigma, hi_sigma)
+
+    for iteration in range(1, max_iter + 1):
+        if active.size == 0:
+            break
+        result = bs_kernel(S[active], K[active], T[active], r[active], guess, flags[active],
+                           outputs=('Price', 'Delta', 'Vega'))
+        diff = result['Price'] - price[active]
+        vega = result['Vega'] * 100  # Kernel reports vega per 1% volatility
+        iterations[active] = iteration
+
+        # A price within tol is not enough: far from the money a wide range of sigma prices
+        # within tol, and vega at the guess overstates vega nearer the root. A guess is
+        # accepted once sigma itself is bounded, either by a bracket narrower than sigma_tol
+        # or by a Newton correction below sigma_tol confirmed by pricing sigma_tol either
+        # side: price is increasing in sigma, so the root lies between probes whose errors
+        # have opposite signs beyond rounding.
+        noise = PRICE_EPS * (np.abs(result['Delta']) * S[active] + price[active]) + PRICE_FLOOR
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = np.abs(diff) / vega
+        candidate = np.flatnonzero((np.abs(diff) < tol) & (step < sigma_tol) & (vega * sigma_tol > noise))
+        contracts = active[candidate]
+        probe_sigma = np.maximum(guess[candidate] + np.array([[-sigma_tol], [sigma_tol]]), lo_sigma)
+        probes = bs_kernel(S[contracts], K[contracts], T[contracts], r[contracts], probe_sigma,
+                           flags[contracts])['Price']
+        converged = hi - lo < sigma_tol
+        margin = noise[candidate]
+        converged[candidate[(probes[0] < price[contracts] - margin) & (probes[1] > price[contracts] + margin)]] = True
+        # Price matched to rounding error while sigma is still loose: the price carries no
+        # more information about volatility
+        flat = ~converged & (np.abs(diff) <= noise)
+        done = converged | flat
+        sigma[active[converged]] = guess[converged]
+        status[active[converged]] = CONVERGED
+        status[active[flat]] = NO_VEGA
+
+        # Price is increasing in sigma, so the sign of the error tightens the bracket
+        above = diff > 0
+        hi = np.where(above, guess, hi)
+        lo = np.where(above, lo, guess)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            newton = guess - diff / vega
+        use_newton = (vega > vega_floor) & (newton > lo) & (newton < hi)
+        guess = np.where(use_newton, newton, 0.5 * (lo + hi))
+
+        keep = ~done
+        active, lo, hi, guess = active[keep], lo[keep], hi[keep], guess[keep]
+
+    return {
+        'Implied Volatility': sigma.reshape(shape)[()],
+        'Status': status.reshape(shape)[()],
+        'Iterations': iterations.reshape(shape)[()],
+    }
+
+
+def implied_volatility_chain(chain, S, r, price_column='Price', strike_column='Strike',
+                             expiry_column='Expiry', type_column='Type', **solver_kwargs):
+    """
+    Adds implied volatility, status and iteration columns to an option chain DataFrame.
+
+    Parameters:
+    chain (pd.DataFrame): One row per contract with price, strike, expiry (years) and
+        'call'/'put' type columns.
+    S (float): Spot price of the underlying.
+    r (float): Risk-free rate.
+    **solver_kwargs: Passed to implied_volatility.
+
+    Returns:
+    pd.DataFrame: A copy of the chain with 'Implied Volatility', 'Status' and 'Iterations'.
+    """
+    result = implied_volatility(chain[price_column].to_numpy(), S, chain[strike_column].to_numpy(),
+                                chain[expiry_column].to_numpy(), r, chain[type_column].to_numpy(),
+                                **solver_kwargs)
+    chain = chain.copy()
+    chain['Implied Volatility'] = result['Implied Volatility']
+    chain['Status'] = [STATUS_LABELS[code] for code in result['Status']]
+    chain['Iterations'] = result['Iterations']
+    return chain
@@ -0,0 +1,162 @@
+import numpy as np
+from src.option_pricer import black_scholes, option_flags
+
+LATTICE_METHODS = ('binomial', 'trinomial')
+
+
+def _lattice_parameters(T, r, sigma, n_steps, method):
+    # Per-contract node spacing, branch probabilities and one-step discount, as (1, n) rows
+    dt = T / n_steps
+    disc = np.exp(-r * dt)
+    if method == 'binomial':
+        # Cox-Ross-Rubinstein
+        u = np.exp(sigma * np.sqrt(dt))
+        p_up = (np.exp(r * dt) - 1 / u) / (u - 1 / u)
+        probabilities = (1 - p_up, p_up)
+    else:
+        # Boyle trinomial with u = exp(sigma * sqrt(2 dt)) and a middle node at the same price
+        u = np.exp(sigma * np.sqrt(2 * dt))
+        a = np.exp(r * dt / 2)
+        b = np.exp(sigma * np.sqrt(dt / 2))
+        p_up = ((a - 1 / b) / (b - 1 / b)) ** 2
+        p_down = ((b - a) / (b - 1 / b)) ** 2
+        probabilities = (p_down, 1 - p_up - p_down, p_up)
+    return u[None, :], tuple((p * disc)[None, :] for p in probabilities)
+
+
+def _check_lattice(T, r, sigma, n_steps, method, contracts):
+    # A lattice needs sigma > 0 and branch probabilities in [0, 1]; otherwise the induction
+    # divides by zero or weights the children negatively and the price is meaningless
+    flat = sigma <= 0
+    if flat.any():
+        raise ValueError(f"The lattice needs sigma > 0; contracts {contracts[flat].tolist()} have sigma <= 0.")
+    _, weights = _lattice_parameters(T, r, sigma, n_steps, method)
+    disc = np.exp(-r * T / n_steps)
+    invalid = np.zeros(T.size, dtype=bool)
+    for weight in weights:
+        p = weight[0] / disc
+        invalid |= (p < 0) | (p > 1)
+    if invalid.any():
+        raise ValueError(f"Branch probabilities fall outside [0, 1] with n_steps={n_steps} for contracts "
+                         f"{contracts[invalid].tolist()}. Increase n_steps or check r and sigma.")
+
+
+def _induct(S, K, T, r, sigma, w, american, n_steps, method, smooth, values, spot, scratch, product):
+    """Backward induction for one batch of contracts, in place on the given buffers."""
+    n = S.size
+    width = n_steps + 1 if method == 'binomial' else 2 * n_steps + 1
+    u, weights = _lattice_parameters(T, r, sigma, n_steps, method)
+    # Nodes run along the first axis so every per-step slice below is one contiguous block
+    values, spot, scratch, product = (buffer[:width * n].reshape(width, n)
+                                      for buffer in (values, spot, scratch, product))
+    S, K, w, r, sigma, T = (x[None, :] for x in (S, K, w, r, sigma, T))
+
+    # Terminal spots: S u^(2j - N) for the binomial tree, S u^(j - N) for the trinomial tree
+    exponent = 2 * np.arange(width) - n_steps if method == 'binomial' else np.arange(width) - n_steps
+    np.power(u, exponent[:, None], out=spot)
+    spot *= S
+    np.subtract(spot, K, out=values)
+    values *= w
+    np.maximum(values, 0, out=values)
+
+    first_step = n_steps - 1
+    if smooth:
+        # Replace the last step by the closed-form price over one dt, which removes the
+        # odd/even oscillation of plain lattices and makes Richardson extrapolation effective
+        first_step = n_steps - 2
+        nodes = n_steps if method == 'binomial' else 2 * n_steps - 1
+        s = spot[:nodes]
+        s *= u
+        values[:nodes] = black_scholes(s, K, T / n_steps, r, sigma, w > 0)
+        if american:
+            np.maximum(values[:nodes], w * (s - K), out=values[:nodes])
+
+    for step in range(first_step, -1, -1):
+        nodes = step + 1 if method == 'binomial' else 2 * step + 1
+        v = values[:nodes]
+        # Node j at this step combines children j..j+len(weights)-1 of the next step; the
+        # shifted children are read into scratch before v is overwritten
+        np.multiply(values[1:nodes + 1], weights[1], out=scratch[:nodes])
+        if len(weights) == 3:
+            np.multiply(values[2:nodes + 2], weights[2], out=product[:nodes])
+            scratch[:nodes] += product[:nodes]
+        v *= weights[0]
+        v += scratch[:nodes]
+
+        if american:
+            # Spot at node j of this step is the next step's node j times u
+            s = spot[:nodes]
+            s *= u
+            np.subtract(s, K, out=scratch[:nodes])
+            scratch[:nodes] *= w
+            np.maximum(v, scratch[:nodes], out=v)
+
+    return values[0].copy()
+
+
+def lattice_price(S, K, T, r, sigma, option_type='call', american=True, n_steps=500, method='binomial',
+                  richardson=False, smooth=None, batch_size=1024):
+    """
+    Prices American or European options on a binomial (CRR) or trinomial lattice.
+
+    A whole batch of contracts is inducted together: each time step is a handful of array
+    operations over (nodes, contracts), done in place on buffers allocated once and reused
+    for every batch.
+
+    Parameters:
+    S, K, T, r, sigma (float or array-like): Spot, strike, time to expiry (years), risk-free
+        rate and volatility. Broadcast against each other.
+    option_type (str, bool or array-like): See option_flags.
+    american (bool): Allow early exercise.
+    n_steps (int): Time steps in the lattice.
+    method (str): 'binomial' or 'trinomial'.
+    richardson (bool): Combine n_steps and n_steps // 2 lattices as 2 P(N) - P(N/2), removing
+        the leading 1/N error term so fewer steps give the same accuracy.
+    smooth (bool, optional): Price the final step with black_scholes (the Broadie-Detemple
+        smoothed lattice). Defaults to richardson, since extrapolation needs the smooth
+        convergence this gives.
+    batch_size (int): Contracts inducted together; bounds memory to four
+        batch_size x (2 * n_steps + 1) arrays.
+
+    Returns:
+    float or ndarray: Option prices; intrinsic value where T <= 0.
+
+    Raises:
+    ValueError: If a live contract has sigma <= 0, or a rate so large against sigma that the
+        branch probabilities leave [0, 1] at this n_steps. Contracts are named by their
+        position in the flattened, broadcast inputs.
+    """
+    if method not in LATTICE_METHODS:
+        raise ValueError(f"Invalid lattice method '{method}'. Choose from {LATTICE_METHODS}.")
+    smooth = richardson if smooth is None else smooth
+    if n_steps < (4 if richardson else 2 if smooth else 1):
+        raise ValueError("n_steps is too small for the lattice.")
+
+    S, K, T, r, sigma = (np.asarray(x, dtype=float) for x in (S, K, T, r, sigma))
+    flags = option_flags(option_type)
+    shape = np.broadcast_shapes(S.shape, K.shape, T.shape, r.shape, sigma.shape, np.shape(flags))
+    S, K, T, r, sigma, flags = (np.broadcast_to(x, shape).ravel() for x in (S, K, T, r, sigma, flags))
+    w = np.where(flags, 1.0, -1.0)
+
+    # Expired contracts are worth their intrinsic value; a zero time step has no lattice
+    prices = np.maximum(w * (S - K), 0)
+    live = np.flatnonzero(T > 0)
+    S, K, T, r, sigma, w = (x[live] for x in (S, K, T, r, sigma, w))
+    for steps in ((n_steps, n_steps // 2) if richardson else (n_steps,)):
+        _check_lattice(T, r, sigma, steps, method, live)
+
+    width = n_steps + 1 if method == 'binomial' else 2 * n_steps + 1
+    rows = min(batch_size, max(S.size, 1))
+    values, spot, scratch, product = (np.empty(rows * width) for _ in range(4))
+
+    for start in range(0, S.size, rows):
+        batch = slice(start, start + rows)
+        args = (S[batch], K[batch], T[batch], r[batch], sigma[batch], w[batch], american)
+        buffers = (values, spot, scratch, product)
+        price = _induct(*args, n_steps, method, smooth, *buffers)
+        if richardson:
+            price = 2 * price - _induct(*args, n_steps // 2, method, smooth, *buffers)
+        prices[live[batch]] = price
+
+    prices = prices.reshape(shape)
+    return prices[()] if prices.ndim == 0 else prices
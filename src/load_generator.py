@@ -0,0 +1,151 @@
+"""
+Load generator for testing the pricing service on localhost.
+
+Run from the repository root, against a running service or one started for the test:
+
+    python -m src.service --port 8765 &
+    python -m src.load_generator --port 8765 --connections 64 --requests 20000
+    python -m src.load_generator --spawn             # starts and stops its own service
+
+Each connection sends requests back to back over HTTP/1.1 keep-alive, so --connections is
+the number of requests in flight. A share of contracts (--repeat-fraction) is drawn from a
+small fixed pool to exercise the service cache; the rest are random. The report gives
+client-side throughput and latency percentiles followed by the service's /metrics.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+
+async def _request(reader, writer, method, path, payload=None):
+    body = b'' if payload is None else json.dumps(payload).encode()
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = next(int(line.split(b':', 1)[1]) for line in head.split(b'\r\n')
+                  if line.lower().startswith(b'content-length:'))
+    return status, json.loads(await reader.readexactly(length))
+
+
+def make_contracts(n, repeat_fraction=0.2, pool_size=100, seed=0):
+    """Random contracts, with repeat_fraction of them drawn from a pool of pool_size."""
+    rng = np.random.default_rng(seed)
+
+    def draw(size):
+        return [{'S': float(s), 'K': float(k), 'T': float(t), 'r': 0.05, 'sigma': float(v),
+                 'option_type': 'call' if c else 'put'}
+                for s, k, t, v, c in zip(rng.uniform(80, 120, size), rng.uniform(80, 120, size),
+                                         rng.uniform(0.1, 2, size), rng.uniform(0.1, 0.5, size),
+                                         rng.random(size) < 0.5)]
+
+    pool = draw(pool_size)
+    fresh = draw(n)
+    repeat = rng.random(n) < repeat_fraction
+    picks = rng.integers(0, pool_size, n)
+    return [pool[p] if r else c for c, r, p in zip(fresh, repeat, picks)]
+
+
+async def run_load(host, port, connections=64, requests=20_000, contracts_per_request=1, repeat_fraction=0.2):
+    """
+    Sends requests POST /price requests over the given number of connections.
+
+    Returns:
+    dict: Client-side 'Requests', 'Errors', 'Seconds', 'Throughput (req/s)', latency
+        percentiles in ms, and the service's 'Server Metrics'.
+    """
+    contracts = make_contracts(requests * contracts_per_request, repeat_fraction)
+    payloads = [contracts[i * contracts_per_request:(i + 1) * contracts_per_request] for i in range(requests)]
+    payloads = [p[0] if contracts_per_request == 1 else {'contracts': p} for p in payloads]
+    latencies = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, next_index
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while next_index < len(payloads):
+                payload = payloads[next_index]
+                next_index += 1
+                start = time.perf_counter()
+                status, _ = await _request(reader, writer, 'POST', '/price', payload)
+                latencies.append(time.perf_counter() - start)
+                errors += status != 200
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    _, server_metrics = await _request(reader, writer, 'GET', '/metrics')
+    writer.close()
+
+    p50, p90, p99 = np.percentile(np.array(latencies) * 1000, [50, 90, 99])
+    return {
+        'Requests': len(latencies),
+        'Errors': errors,
+        'Seconds': elapsed,
+        'Throughput (req/s)': len(latencies) / elapsed,
+        'Latency p50 (ms)': p50,
+        'Latency p90 (ms)': p90,
+        'Latency p99 (ms)': p99,
+        'Server Metrics': server_metrics,
+    }
+
+
+def _spawn_service(args):
+    # Port 0 lets the service pick a free port, which it prints once listening
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'src.service', '--host', args.host, '--port', '0',
+         '--max-batch', str(args.max_batch), '--max-delay-ms', str(args.max_delay_ms)],
+        stdout=subprocess.PIPE, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    line = process.stdout.readline()
+    if not line:
+        process.kill()
+        raise RuntimeError("The pricing service failed to start.")
+    return process, int(line.rstrip().rsplit(':', 1)[1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--spawn', action='store_true', help='Start a service on a free port for the test')
+    parser.add_argument('--connections', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=20_000)
+    parser.add_argument('--contracts-per-request', type=int, default=1)
+    parser.add_argument('--repeat-fraction', type=float, default=0.2)
+    parser.add_argument('--max-batch', type=int, default=4096, help='Service setting when spawning')
+    parser.add_argument('--max-delay-ms', type=float, default=2.0, help='Service setting when spawning')
+    args = parser.parse_args(argv)
+
+    process, port = _spawn_service(args) if args.spawn else (None, args.port)
+    try:
+        report = asyncio.run(run_load(args.host, port, args.connections, args.requests,
+                                      args.contracts_per_request, args.repeat_fraction))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    server = report.pop('Server Metrics')
+    for name, value in report.items():
+        print(f"{name:<24}{value:,.2f}" if isinstance(value, float) else f"{name:<24}{value:,}")
+    print("Server metrics:")
+    for name, value in server.items():
+        print(f"  {name:<30}{value:,.2f}" if isinstance(value, float) else f"  {name:<30}{value}")
+    return 1 if report['Errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import math
+import os
+import warnings
+
+import numpy as np
+
+# Standard normal CDF/PDF backends used by the pricing kernels.
+#
+# Every backend exposes ufunc-style functions taking an `out=` array so the kernels can
+# evaluate in place. The backend is chosen once at import time from BSTOOL_NORMAL_BACKEND,
+# defaulting to scipy.special.ndtr. Numba is opt-in: it is no faster than ndtr on large
+# arrays and importing it costs more than pricing a typical batch. Neither path imports
+# scipy.stats, which is slow to import and has high per-call overhead.
+
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+_INV_SQRT_2 = 1.0 / math.sqrt(2.0)
+
+
+def _numpy_pdf(x, out=None):
+    out = np.square(x, out=out)
+    out *= -0.5
+    np.exp(out, out=out)
+    out *= _INV_SQRT_2PI
+    return out
+
+
+def _load_scipy():
+    from scipy.special import ndtr
+    return ndtr, _numpy_pdf
+
+
+def _load_numba():
+    from numba import vectorize
+
+    @vectorize(['float64(float64)'], cache=True)
+    def cdf(x):
+        return 0.5 * math.erfc(-x * _INV_SQRT_2)
+
+    return cdf, _numpy_pdf
+
+
+BACKENDS = {
+    'scipy': _load_scipy,
+    'numba': _load_numba,
+}
+
+backend = None
+norm_cdf = None
+norm_pdf = None
+
+
+def set_backend(name):
+    """
+    Switches the normal CDF/PDF implementation used by the pricers.
+
+    Parameters:
+    name (str): One of BACKENDS.
+    """
+    global backend, norm_cdf, norm_pdf
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown normal backend '{name}'. Choose from {sorted(BACKENDS)}.")
+    norm_cdf, norm_pdf = BACKENDS[name]()
+    backend = name
+
+
+def _select_default_backend():
+    requested = os.environ.get('BSTOOL_NORMAL_BACKEND', 'scipy')
+    try:
+        set_backend(requested)
+    except (ImportError, ValueError) as exc:
+        # Optional backend not installed, or a misspelt name; the pricers must still import
+        warnings.warn(f"Normal backend '{requested}' is unavailable, using 'scipy': {exc}")
+        set_backend('scipy')
+
+
+_select_default_backend()
@@ -1,16 +1,215 @@
 import numpy as np
-from scipy.stats import norm
+from src import normal
+
+
+def option_flags(option_type):
+    """
+    Converts an option type (or an array of them) into call flags.
+
+    Parameters:
+    option_type (str, bool or array-like): 'call'/'put', or an array of such strings,
+        or a boolean array where True means call.
+
+    Returns:
+    bool or ndarray: True for calls, False for puts.
+    """
+    if isinstance(option_type, str):
+        if option_type not in ('call', 'put'):
+            raise ValueError("Invalid option type. Choose 'call' or 'put'.")
+        return option_type == 'call'
+
+    flags = np.asarray(option_type)
+    if flags.dtype == bool:
+        return flags
+    if flags.dtype.kind in ('U', 'S', 'O'):
+        is_call = flags == 'call'
+        if not np.all(is_call | (flags == 'put')):
+            raise ValueError("Invalid option type. Choose 'call' or 'put'.")
+        return is_call
+    raise ValueError("Invalid option type. Choose 'call' or 'put'.")
+
+
+def _scalar_or_array(values):
+    # 0-d results come back as NumPy scalars so scalar callers keep getting floats
+    return values[()] if values.ndim == 0 else values
+
+
+# Outputs the fused kernel knows how to produce, in evaluation order
+KERNEL_OUTPUTS = ('Price', 'Delta', 'Gamma', 'Vega', 'Theta', 'Rho', 'Vanna', 'Volga', 'Charm')
+FIRST_ORDER_OUTPUTS = ('Price', 'Delta', 'Gamma', 'Vega', 'Theta', 'Rho')
+
+_WORKSPACE_KEYS = ('w', 'sqrt_T', 'sigma_sqrt_T', 'd1', 'd2', 'discounted_K', 'cdf_d1', 'cdf_d2', 'pdf_d1', 'tmp')
+
+
+def make_workspace(shape):
+    """
+    Allocates the scratch arrays bs_kernel needs for a book of the given shape.
+
+    Reusing one workspace (and one set of out= arrays) across calls means repeated
+    revaluation of a fixed-size book does not allocate.
+    """
+    return {key: np.empty(shape) for key in _WORKSPACE_KEYS}
+
+
+def make_outputs(shape, outputs=FIRST_ORDER_OUTPUTS):
+    """Allocates an out= dict for bs_kernel."""
+    return {name: np.empty(shape) for name in outputs}
+
+
+def bs_kernel(S, K, T, r, sigma, option_type='call', outputs=('Price',), out=None, workspace=None):
+    """
+    Fused Black-Scholes kernel: computes the price and any subset of Greeks in one pass.
+
+    d1, d2, the discount factor and the normal CDF/PDF values are evaluated once and shared
+    by every requested output. All arithmetic is done in place, so passing `out` and
+    `workspace` arrays of the broadcast shape makes the call allocation-free.
+
+    Parameters:
+    S, K, T, r, sigma (float or array-like): Spot, strike, time to expiry (years),
+        risk-free rate and volatility. Broadcast against each other.
+    option_type (str, bool or array-like): See option_flags.
+    outputs (iterable of str): Names from KERNEL_OUTPUTS. Vega, Vanna and Volga are per
+        1% change in volatility, Theta and Charm per day, Rho per 1% change in rate.
+    out (dict, optional): Preallocated arrays keyed by output name (see make_outputs).
+        Missing entries are allocated.
+    workspace (dict, optional): Scratch arrays from make_workspace.
+
+    Returns:
+    dict: Arrays keyed by output name.
+    """
+    outputs = tuple(outputs)
+    unknown = set(outputs) - set(KERNEL_OUTPUTS)
+    if unknown:
+        raise ValueError(f"Unknown kernel outputs: {sorted(unknown)}. Choose from {KERNEL_OUTPUTS}.")
+
+    S, K, T, r, sigma = (np.asarray(x, dtype=float) for x in (S, K, T, r, sigma))
+    flags = option_flags(option_type)
+    shape = np.broadcast_shapes(S.shape, K.shape, T.shape, r.shape, sigma.shape, np.shape(flags))
+
+    ws = make_workspace(shape) if workspace is None else workspace
+    out = {} if out is None else out
+    for name in outputs:
+        if name not in out:
+            out[name] = np.empty(shape)
+
+    w, sqrt_T, sigma_sqrt_T = ws['w'], ws['sqrt_T'], ws['sigma_sqrt_T']
+    d1, d2, discounted_K = ws['d1'], ws['d2'], ws['discounted_K']
+    cdf_d1, cdf_d2, pdf_d1, tmp = ws['cdf_d1'], ws['cdf_d2'], ws['pdf_d1'], ws['tmp']
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # +1 for calls, -1 for puts lets both payoffs share one formula
+        np.copyto(w, flags)
+        w *= 2.0
+        w -= 1.0
+
+        np.sqrt(T, out=sqrt_T)
+        np.multiply(sigma, sqrt_T, out=sigma_sqrt_T)
+
+        np.divide(S, K, out=d1)
+        np.log(d1, out=d1)
+        np.multiply(sigma, sigma, out=tmp)
+        tmp *= 0.5
+        tmp += r
+        tmp *= T
+        d1 += tmp
+        d1 /= sigma_sqrt_T
+        np.subtract(d1, sigma_sqrt_T, out=d2)
+
+        np.multiply(r, T, out=discounted_K)
+        np.negative(discounted_K, out=discounted_K)
+        np.exp(discounted_K, out=discounted_K)
+        discounted_K *= K
+
+        np.multiply(w, d1, out=cdf_d1)
+        normal.norm_cdf(cdf_d1, out=cdf_d1)
+        np.multiply(w, d2, out=cdf_d2)
+        normal.norm_cdf(cdf_d2, out=cdf_d2)
+
+        if any(name not in ('Price', 'Delta', 'Rho') for name in outputs):
+            normal.norm_pdf(d1, out=pdf_d1)
+
+        for name in outputs:
+            o = out[name]
+            if name == 'Price':
+                np.multiply(S, cdf_d1, out=o)
+                np.multiply(discounted_K, cdf_d2, out=tmp)
+                o -= tmp
+                o *= w
+            elif name == 'Delta':
+                np.multiply(w, cdf_d1, out=o)
+            elif name == 'Gamma':
+                np.multiply(S, sigma_sqrt_T, out=o)
+                np.divide(pdf_d1, o, out=o)
+            elif name == 'Vega':
+                np.multiply(S, pdf_d1, out=o)
+                o *= sqrt_T
+                o /= 100  # Vega is often reported per 1% change in volatility
+            elif name == 'Theta':
+                np.multiply(S, pdf_d1, out=o)
+                o *= sigma
+                o /= sqrt_T
+                o *= -0.5
+                np.multiply(w, r, out=tmp)
+                tmp *= discounted_K
+                tmp *= cdf_d2
+                o -= tmp
+                o /= 365  # Theta is often reported per day
+            elif name == 'Rho':
+                np.multiply(w, T, out=o)
+                o *= discounted_K
+                o *= cdf_d2
+                o /= 100  # Rho is often reported per 1% change in interest rate
+            elif name == 'Vanna':
+                # dDelta/dsigma = -pdf(d1) * d2 / sigma
+                np.multiply(pdf_d1, d2, out=o)
+                o /= sigma
+                o /= -100
+            elif name == 'Volga':
+                # dVega/dsigma = vega * d1 * d2 / sigma
+                np.multiply(S, pdf_d1, out=o)
+                o *= sqrt_T
+                o *= d1
+                o *= d2
+                o /= sigma
+                o /= 10000
+            elif name == 'Charm':
+                # Delta decay, -dDelta/dT = -pdf(d1) * (2rT - d2 sigma sqrt(T)) / (2T sigma sqrt(T))
+                np.multiply(r, T, out=o)
+                o *= 2
+                np.multiply(d2, sigma_sqrt_T, out=tmp)
+                o -= tmp
+                np.multiply(T, sigma_sqrt_T, out=tmp)
+                tmp *= 2
+                o /= tmp
+                o *= pdf_d1
+                o /= -365
+
+    return out
+
+
+# Vectorized Black-Scholes price and Greeks
+def black_scholes_batch(S, K, T, r, sigma, option_type='call', greeks=True):
+    """
+    Prices a batch of European options and their Greeks in one pass.
+
+    All numeric inputs are broadcast against each other, so a single strike can be
+    priced over a grid of spots, or a whole book can be passed as parallel arrays.
+
+    Parameters:
+    S, K, T, r, sigma (float or array-like): Spot, strike, time to expiry (years),
+        risk-free rate and volatility.
+    option_type (str, bool or array-like): See option_flags.
+    greeks (bool): Whether to compute the Greeks alongside the price.
+
+    Returns:
+    dict: 'Price' and, if requested, 'Delta', 'Gamma', 'Vega' (per 1% vol),
+        'Theta' (per day) and 'Rho' (per 1% rate).
+    """
+    outputs = FIRST_ORDER_OUTPUTS if greeks else ('Price',)
+    results = bs_kernel(S, K, T, r, sigma, option_type, outputs)
+    return {name: _scalar_or_array(values) for name, values in results.items()}
+
 
 # Black-Scholes option pricing function
 def black_scholes(S, K, T, r, sigma, option_type='call'):
-    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-
-    if option_type == 'call':
-        price = S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-    elif option_type == 'put':
-        price = K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
-    else:
-        raise ValueError("Invalid option type. Choose 'call' or 'put'.")
-    
-    return price
+    return black_scholes_batch(S, K, T, r, sigma, option_type, greeks=False)['Price']
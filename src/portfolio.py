@@ -0,0 +1,163 @@
+import numpy as np
+from src.option_pricer import bs_kernel, FIRST_ORDER_OUTPUTS
+
+# Instrument codes stored in Portfolio.kind
+CALL = 0
+PUT = 1
+STOCK = 2
+INSTRUMENTS = {'call': CALL, 'put': PUT, 'stock': STOCK}
+
+
+def _instrument_codes(kind):
+    kind = np.atleast_1d(np.asarray(kind))
+    if kind.dtype.kind in ('U', 'S', 'O'):
+        unknown = set(kind.tolist()) - set(INSTRUMENTS)
+        if unknown:
+            raise ValueError(f"Invalid instrument {sorted(unknown)}. Choose from {sorted(INSTRUMENTS)}.")
+        return np.array([INSTRUMENTS[k] for k in kind.tolist()], dtype=np.int8)
+    invalid = ~np.isin(kind, list(INSTRUMENTS.values()))
+    if invalid.any():
+        raise ValueError(f"Invalid instrument codes {sorted(set(kind[invalid].tolist()))}. "
+                         f"Choose from {sorted(INSTRUMENTS.values())}.")
+    return kind.astype(np.int8)
+
+
+class Portfolio:
+    """
+    Book of option and stock legs stored as parallel arrays (struct of arrays).
+
+    Every leg has an instrument code (CALL, PUT or STOCK), a strike, an expiry in years,
+    a signed quantity (positive is long), the premium paid per unit and the id of the
+    position it belongs to. Pricing, Greeks and payoffs are evaluated for all legs in one
+    vectorized call and then summed per position, so thousands of multi-leg positions can
+    be revalued together.
+
+    Market inputs (S, r, sigma) broadcast against the leg axis, which is always last:
+    pass per-leg arrays of shape (n_legs,) or add leading axes to evaluate many market
+    states at once.
+    """
+
+    def __init__(self, kind, strike, expiry, quantity=1.0, premium=0.0, position=0):
+        kind = _instrument_codes(kind)
+        n = kind.size
+        strike, expiry, quantity, premium = (np.broadcast_to(np.asarray(x, dtype=float), n).copy()
+                                             for x in (strike, expiry, quantity, premium))
+        position = np.broadcast_to(np.asarray(position, dtype=np.int64), n)
+
+        # Keep legs grouped by position so per-position sums are a single reduceat
+        order = np.argsort(position, kind='stable')
+        self.kind = kind[order]
+        self.strike = strike[order]
+        self.expiry = expiry[order]
+        self.quantity = quantity[order]
+        self.premium = premium[order]
+        self.position = position[order]
+        self.position_ids, self._starts = np.unique(self.position, return_index=True)
+
+    @classmethod
+    def from_legs(cls, legs, position=0):
+        """
+        Builds a single position from (instrument, strike, expiry, quantity) tuples.
+
+        Stock legs take None for strike and expiry.
+        """
+        kind, strike, expiry, quantity = zip(*legs)
+        strike = [np.nan if k is None else k for k in strike]
+        expiry = [0.0 if t is None else t for t in expiry]
+        return cls(list(kind), strike, expiry, quantity, position=position)
+
+    @classmethod
+    def concat(cls, portfolios):
+        """Combines portfolios into one book, renumbering positions so they stay distinct."""
+        offset = 0
+        positions = []
+        for portfolio in portfolios:
+            ids = np.searchsorted(portfolio.position_ids, portfolio.position)
+            positions.append(ids + offset)
+            offset += portfolio.n_positions
+        return cls(np.concatenate([p.kind for p in portfolios]),
+                   np.concatenate([p.strike for p in portfolios]),
+                   np.concatenate([p.expiry for p in portfolios]),
+                   np.concatenate([p.quantity for p in portfolios]),
+                   np.concatenate([p.premium for p in portfolios]),
+                   np.concatenate(positions))
+
+    @property
+    def n_legs(self):
+        return self.kind.size
+
+    @property
+    def n_positions(self):
+        return self.position_ids.size
+
+    def scaled(self, factor):
+        """Returns a copy with every quantity multiplied by factor."""
+        return Portfolio(self.kind, self.strike, self.expiry, self.quantity * factor, self.premium, self.position)
+
+    def _aggregate(self, per_leg):
+        # Sum quantity-weighted leg values into positions along the last axis
+        return np.add.reduceat(per_leg * self.quantity, self._starts, axis=-1)
+
+    def leg_values(self, S, r, sigma, time_elapsed=0.0, outputs=('Price',)):
+        """
+        Per-unit model values of every leg.
+
+        Options are priced with Black-Scholes on their remaining time to expiry and fall back
+        to intrinsic value (with zero Greeks) once expired. Stock legs are worth S with a
+        delta of one.
+
+        Parameters:
+        S, r, sigma (float or array-like): Market inputs, broadcast against the leg axis.
+        time_elapsed (float or array-like): Years elapsed since the expiries were set.
+        outputs (iterable of str): Kernel outputs to compute (see bs_kernel).
+
+        Returns:
+        dict: Arrays of shape (..., n_legs) keyed by output name.
+        """
+        S = np.asarray(S, dtype=float)
+        remaining = self.expiry - np.asarray(time_elapsed, dtype=float)[..., np.newaxis]
+        live = remaining > 0
+        is_stock = self.kind == STOCK
+        is_call = self.kind == CALL
+        strike = np.where(is_stock, 1.0, self.strike)
+
+        values = bs_kernel(S, strike, np.where(live, remaining, 1.0), r, sigma, is_call, outputs)
+        if not is_stock.any() and live.all():
+            # Only live options, so the kernel values need no patching
+            return values
+        intrinsic = np.maximum(np.where(is_call, S - strike, strike - S), 0)
+        for name, value in values.items():
+            if name == 'Price':
+                value[...] = np.where(is_stock, S, np.where(live, value, intrinsic))
+            elif name == 'Delta':
+                value[...] = np.where(is_stock, 1.0, np.where(live, value, 0.0))
+            else:
+                value[...] = np.where(is_stock | ~live, 0.0, value)
+        return values
+
+    def value(self, S, r, sigma, time_elapsed=0.0):
+        """Marked-to-model value of each position, shape (..., n_positions)."""
+        return self._aggregate(self.leg_values(S, r, sigma, time_elapsed)['Price'])
+
+    def greeks(self, S, r, sigma, time_elapsed=0.0, outputs=FIRST_ORDER_OUTPUTS):
+        """Quantity-weighted price and Greeks per position, each of shape (..., n_positions)."""
+        values = self.leg_values(S, r, sigma, time_elapsed, outputs)
+        return {name: self._aggregate(value) for name, value in values.items()}
+
+    def with_premiums(self, S, r, sigma):
+        """Returns a copy whose premiums are the current model values (stock legs cost S)."""
+        premium = np.broadcast_to(self.leg_values(S, r, sigma)['Price'], self.kind.shape)
+        return Portfolio(self.kind, self.strike, self.expiry, self.quantity, premium, self.position)
+
+    def payoff(self, prices):
+        """
+        Net payoff at expiry of each position over a grid of stock prices.
+
+        Returns:
+        ndarray: Shape (n_positions, n_prices), premiums paid deducted.
+        """
+        prices = np.asarray(prices, dtype=float)[:, np.newaxis]
+        value = np.where(self.kind == CALL, np.maximum(prices - self.strike, 0),
+                         np.where(self.kind == PUT, np.maximum(self.strike - prices, 0), prices))
+        value -= self.premium
+        return self._aggregate(value).T
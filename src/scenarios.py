@@ -0,0 +1,147 @@
+"""
+Scenario and stress-grid revaluation of a Portfolio.
+
+A scenario is a set of shocks applied to the current market: a relative spot move, an
+absolute volatility shift, a number of calendar days elapsed and an absolute rate shift.
+Scenarios are held in a DataFrame with one row per scenario, and the whole book is
+repriced across all of them as one (scenarios x legs) broadcast, chunked over scenarios
+so memory stays bounded for large grids. Legs on the same contract are priced once and
+shared, which for books built on listed strikes and expiries removes most of the work.
+Chunks are small enough to stay in cache and can be spread over threads, since NumPy
+releases the GIL inside its array loops.
+"""
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.portfolio import Portfolio
+
+SHOCKS = ('Spot Shock', 'Vol Shock', 'Days Elapsed', 'Rate Shock')
+DAYS_PER_YEAR = 365
+MIN_VOLATILITY = 1e-4
+
+
+def scenario_grid(spot=(0.0,), vol=(0.0,), days=(0,), rate=(0.0,)):
+    """
+    Cartesian grid of shocks.
+
+    Parameters:
+    spot (iterable of float): Relative spot moves, e.g. -0.1 for a 10% fall.
+    vol (iterable of float): Absolute volatility shifts, e.g. 0.05 for +5 vol points.
+    days (iterable of float): Calendar days elapsed.
+    rate (iterable of float): Absolute rate shifts.
+
+    Returns:
+    DataFrame: One row per combination with columns SHOCKS.
+    """
+    return pd.DataFrame(list(itertools.product(spot, vol, days, rate)), columns=list(SHOCKS), dtype=float)
+
+
+def scenarios(spot=0.0, vol=0.0, days=0.0, rate=0.0):
+    """
+    Scenarios from shocks given element-wise (broadcast against each other), e.g. a list of
+    historical stress days.
+
+    Returns:
+    DataFrame: One row per scenario with columns SHOCKS.
+    """
+    columns = np.broadcast_arrays(*(np.atleast_1d(np.asarray(x, dtype=float)) for x in (spot, vol, days, rate)))
+    return pd.DataFrame(dict(zip(SHOCKS, columns)))
+
+
+def _unique_contracts(portfolio, S, r, sigma):
+    # Legs with the same instrument, strike, expiry and market inputs share one valuation
+    columns = [np.broadcast_to(x, portfolio.n_legs)
+               for x in (portfolio.kind, portfolio.strike, portfolio.expiry, S, r, sigma)]
+    _, index, inverse = np.unique(np.column_stack(columns), axis=0, return_index=True, return_inverse=True)
+    contracts = Portfolio(portfolio.kind[index], portfolio.strike[index], portfolio.expiry[index],
+                          position=np.arange(index.size))
+    # Sparse (contracts x positions) matrix of summed quantities maps contract P&L to positions
+    positions = np.searchsorted(portfolio.position_ids, portfolio.position)
+    weights = sparse.csc_matrix((portfolio.quantity, (inverse.ravel(), positions)),
+                                shape=(index.size, portfolio.n_positions))
+    return contracts, index, weights
+
+
+def scenario_pnl(portfolio, S, r, sigma, scenario_frame, time_elapsed=0.0, max_elements=2 ** 16,
+                 max_workers=1):
+    """
+    P&L of every position under every scenario, relative to the unshocked market.
+
+    Parameters:
+    portfolio (Portfolio): Book to revalue.
+    S, r, sigma (float or array-like): Current market inputs, scalars or arrays of shape (n_legs,).
+    scenario_frame (DataFrame): Shocks with columns SHOCKS, e.g. from scenario_grid.
+    time_elapsed (float): Years already elapsed since the expiries were set.
+    max_elements (int): Upper bound on scenarios x legs priced per chunk; at least one
+        scenario is priced per chunk.
+    max_workers (int): Threads pricing chunks concurrently; None uses every core.
+
+    Returns:
+    ndarray: Shape (n_scenarios, n_positions).
+    """
+    missing = set(SHOCKS) - set(scenario_frame.columns)
+    if missing:
+        raise ValueError(f"Scenarios are missing shocks {sorted(missing)}.")
+    spot, vol, days, rate = (scenario_frame[name].to_numpy(dtype=float) for name in SHOCKS)
+    S, r, sigma = (np.asarray(x, dtype=float) for x in (S, r, sigma))
+
+    contracts, index, weights = _unique_contracts(portfolio, S, r, sigma)
+    S, r, sigma = (np.broadcast_to(x, portfolio.n_legs)[index] for x in (S, r, sigma))
+    base = contracts.value(S, r, sigma, time_elapsed)
+    pnl = np.empty((spot.size, portfolio.n_positions))
+    rows = max(1, max_elements // contracts.n_legs)
+
+    def revalue(start):
+        chunk = slice(start, start + rows)
+        # Scenarios along the leading axis, contracts along the last
+        shocked = contracts.value(
+            S * (1 + spot[chunk, np.newaxis]),
+            r + rate[chunk, np.newaxis],
+            np.maximum(sigma + vol[chunk, np.newaxis], MIN_VOLATILITY),
+            time_elapsed + days[chunk] / DAYS_PER_YEAR,
+        )
+        shocked -= base
+        pnl[chunk] = shocked @ weights
+
+    starts = range(0, spot.size, rows)
+    if max_workers == 1:
+        for start in starts:
+            revalue(start)
+    else:
+        # Each chunk writes its own rows of pnl
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(revalue, starts))
+    return pnl
+
+
+def worst_case(pnl, scenario_frame, position_ids=None, n_worst=10):
+    """
+    Worst-case summaries of a scenario P&L matrix.
+
+    Parameters:
+    pnl (ndarray): Shape (n_scenarios, n_positions), from scenario_pnl.
+    scenario_frame (DataFrame): The scenarios pnl was computed for.
+    position_ids (array-like, optional): Labels for the positions, e.g. Portfolio.position_ids.
+    n_worst (int): Number of worst book-level scenarios to report.
+
+    Returns:
+    dict: 'Book', the n_worst scenarios by total book P&L with their shocks; and
+        'Positions', each position's worst and best P&L and the scenario of its worst loss.
+    """
+    book_pnl = pnl.sum(axis=1)
+    order = np.argsort(book_pnl, kind='stable')[:n_worst]
+    book = scenario_frame.iloc[order].copy()
+    book['Book PnL'] = book_pnl[order]
+
+    worst = pnl.argmin(axis=0)
+    columns = np.arange(pnl.shape[1])
+    positions = pd.DataFrame({
+        'Worst PnL': pnl[worst, columns],
+        'Worst Scenario': scenario_frame.index.to_numpy()[worst],
+        'Best PnL': pnl.max(axis=0),
+    }, index=pd.Index(columns if position_ids is None else position_ids, name='Position'))
+    return {'Book': book, 'Positions': positions}
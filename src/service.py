@@ -0,0 +1,352 @@
+"""
+Local HTTP pricing service with request micro-batching.
+
+Run from the repository root:
+
+    python -m src.service --port 8765
+
+Endpoints:
+    POST /price     JSON contract {"S", "K", "T", "r", "sigma", "option_type", "outputs"},
+                    or {"contracts": [...]} for several. Missing r and option_type default
+                    to 0.05 and 'call'; outputs defaults to every first-order output.
+    GET /metrics    Request, cache and batch counters, latency percentiles and throughput.
+    GET /health     Liveness check.
+
+Concurrent requests are queued and priced together: the batcher waits at most
+--max-delay-ms after the first queued contract (or until --max-batch are waiting) and
+prices the whole batch in one bs_kernel call. Recently priced contracts are answered from
+an LRU cache without being queued. The server is plain asyncio over HTTP/1.1 with
+keep-alive, so it needs no web framework.
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from src.option_pricer import bs_kernel, FIRST_ORDER_OUTPUTS
+
+DEFAULT_RATE = 0.05
+
+
+class LRUCache:
+    """Least-recently-used mapping of contract keys to priced results."""
+
+    def __init__(self, max_entries=10_000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class Metrics:
+    """Counters and a sliding window of request latencies."""
+
+    def __init__(self, window=10_000):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.contracts = 0
+        self.cache_hits = 0
+        self.batches = 0
+        self.batched_contracts = 0
+        self.errors = 0
+        self._latencies = deque(maxlen=window)
+        self._completed = deque(maxlen=window)
+
+    def record(self, latency):
+        self._latencies.append(latency)
+        self._completed.append(time.perf_counter())
+
+    def snapshot(self):
+        now = time.perf_counter()
+        latencies = np.array(self._latencies) * 1000
+        recent = np.array(self._completed)
+        recent = recent[recent > now - 10]
+        # The window may hold less than 10s of completions, so rate over the span it covers
+        span = now - recent[0] if recent.size else 0.0
+        percentiles = np.percentile(latencies, [50, 90, 99]).tolist() if latencies.size else [None] * 3
+        return {
+            'Uptime': now - self.started,
+            'Requests': self.requests,
+            'Contracts': self.contracts,
+            'Cache Hits': self.cache_hits,
+            'Batches': self.batches,
+            'Mean Batch Size': self.batched_contracts / self.batches if self.batches else 0.0,
+            'Errors': self.errors,
+            'Latency p50 (ms)': percentiles[0],
+            'Latency p90 (ms)': percentiles[1],
+            'Latency p99 (ms)': percentiles[2],
+            'Throughput (req/s, last 10s)': recent.size / span if span > 0 else 0.0,
+        }
+
+
+def _contract_key(contract):
+    # Hashable (S, K, T, r, sigma, option_type), used both as the cache key and the kernel input
+    try:
+        S, K, T, sigma = float(contract['S']), float(contract['K']), float(contract['T']), float(contract['sigma'])
+        r = float(contract.get('r', DEFAULT_RATE))
+    except KeyError as exc:
+        raise ValueError(f"Contracts need S, K, T and sigma; missing {exc}.")
+    except (TypeError, ValueError):
+        raise ValueError("S, K, T, r and sigma must be numbers.")
+    option_type = contract.get('option_type', 'call')
+    if option_type not in ('call', 'put'):
+        raise ValueError("Invalid option type. Choose 'call' or 'put'.")
+    return S, K, T, r, sigma, option_type
+
+
+class PricingService:
+    """
+    Micro-batching pricer: price(contracts) is awaited by request handlers, and a single
+    background task drains the queue into vectorized bs_kernel calls.
+
+    Parameters:
+    max_batch (int): Contracts priced in one call before the batch is closed; a single
+        request larger than this is still priced whole.
+    max_delay (float): Seconds to wait for more contracts after the first one is queued.
+    cache_size (int): LRU cache entries; 0 disables the cache.
+    """
+
+    def __init__(self, max_batch=4096, max_delay=0.002, cache_size=10_000):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.cache = LRUCache(cache_size) if cache_size else None
+        self.metrics = Metrics()
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def price(self, contracts):
+        """Prices a list of contract dicts, returning one result dict per contract."""
+        keys = [_contract_key(contract) for contract in contracts]
+        self.metrics.contracts += len(keys)
+        results = [self.cache.get(key) if self.cache is not None else None for key in keys]
+        self.metrics.cache_hits += sum(result is not None for result in results)
+
+        # Contracts missing from the cache go through the batcher as one item with one future
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            future = asyncio.get_running_loop().create_future()
+            self._queue.put_nowait(([keys[i] for i in missing], future))
+            for i, result in zip(missing, await future):
+                results[i] = result
+        return results
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0][0])
+            if size < self.max_batch:
+                # Give concurrent requests a moment to join the batch
+                await asyncio.sleep(self.max_delay)
+            while size < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                size += len(batch[-1][0])
+            self._price_batch(batch)
+
+    def _price_batch(self, batch):
+        # One kernel call for the whole batch; a few thousand contracts take about a millisecond,
+        # so it runs inline on the event loop rather than in a thread
+        keys = [key for item_keys, _ in batch for key in item_keys]
+        S, K, T, r, sigma = np.array([key[:5] for key in keys]).T
+        is_call = np.array([key[5] == 'call' for key in keys])
+        try:
+            values = bs_kernel(S, K, T, r, sigma, is_call, FIRST_ORDER_OUTPUTS)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        self.metrics.batches += 1
+        self.metrics.batched_contracts += len(keys)
+        rows = [dict(zip(FIRST_ORDER_OUTPUTS, row))
+                for row in zip(*(values[name].tolist() for name in FIRST_ORDER_OUTPUTS))]
+        if self.cache is not None:
+            for key, result in zip(keys, rows):
+                self.cache.put(key, result)
+        start = 0
+        for item_keys, future in batch:
+            if not future.done():
+                future.set_result(rows[start:start + len(item_keys)])
+            start += len(item_keys)
+
+
+def _select(result, outputs):
+    return result if outputs is None else {name: result[name] for name in outputs}
+
+
+async def _handle_price(service, body):
+    payload = json.loads(body or b'{}')
+    many = isinstance(payload, dict) and 'contracts' in payload
+    contracts = payload['contracts'] if many else [payload]
+    if not isinstance(contracts, list) or not all(isinstance(c, dict) for c in contracts):
+        raise ValueError("Expected a contract object or {'contracts': [...]}.")
+    outputs = [contract.get('outputs') for contract in contracts]
+    for names in outputs:
+        if names is not None and set(names) - set(FIRST_ORDER_OUTPUTS):
+            raise ValueError(f"Outputs must be chosen from {FIRST_ORDER_OUTPUTS}.")
+    results = [_select(result, names) for result, names in zip(await service.price(contracts), outputs)]
+    return {'results': results} if many else results[0]
+
+
+def _json_safe(value):
+    # NaN and infinite results (e.g. from invalid inputs) become null, which JSON can express
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_json_safe(item) for item in value]
+    return value
+
+
+def _parse_head(head):
+    # Request line and headers; returns (method, path, version, headers, content length)
+    request_line, *header_lines = head.decode('latin-1').split('\r\n')
+    parts = request_line.split(' ', 2)
+    if len(parts) != 3:
+        raise ValueError(f"Malformed request line '{request_line}'.")
+    headers = {k.strip().lower(): v.strip() for k, _, v in
+               (line.partition(':') for line in header_lines if line)}
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise ValueError("Content-Length must be an integer.")
+    if length < 0:
+        raise ValueError("Content-Length must not be negative.")
+    return (*parts, headers, length)
+
+
+async def _respond(writer, status, payload, keep_alive):
+    body = json.dumps(_json_safe(payload), allow_nan=False).encode()
+    reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}[status]
+    writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                 .encode() + body)
+    await writer.drain()
+
+
+def make_handler(service):
+    """Returns an asyncio.start_server callback serving the endpoints above over HTTP/1.1."""
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                try:
+                    method, path, version, headers, length = _parse_head(head)
+                except ValueError as exc:
+                    # The body cannot be framed, so answer and close the connection
+                    service.metrics.errors += 1
+                    await _respond(writer, 400, {'error': str(exc)}, keep_alive=False)
+                    break
+                try:
+                    body = await reader.readexactly(length)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+
+                start = time.perf_counter()
+                status = 200
+                try:
+                    if method == 'POST' and path == '/price':
+                        service.metrics.requests += 1
+                        payload = await _handle_price(service, body)
+                        service.metrics.record(time.perf_counter() - start)
+                    elif method == 'GET' and path == '/metrics':
+                        payload = service.metrics.snapshot()
+                        payload['Cache Entries'] = len(service.cache) if service.cache is not None else 0
+                    elif method == 'GET' and path == '/health':
+                        payload = {'status': 'ok'}
+                    else:
+                        status, payload = 404, {'error': f"No endpoint {method} {path}"}
+                except (ValueError, KeyError, TypeError) as exc:
+                    service.metrics.errors += 1
+                    status, payload = 400, {'error': str(exc)}
+                except Exception as exc:  # Report pricing failures instead of dropping the connection
+                    service.metrics.errors += 1
+                    status, payload = 500, {'error': str(exc)}
+
+                await _respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(host='127.0.0.1', port=8765, max_batch=4096, max_delay=0.002, cache_size=10_000, ready=None):
+    """
+    Runs the service until cancelled.
+
+    Parameters:
+    host, port: Address to listen on; port 0 picks a free port.
+    max_batch, max_delay, cache_size: See PricingService.
+    ready (callable, optional): Called with the bound port once the server is listening.
+    """
+    service = PricingService(max_batch, max_delay, cache_size)
+    service.start()
+    server = await asyncio.start_server(make_handler(service), host, port, backlog=1024)
+    if ready is not None:
+        ready(server.sockets[0].getsockname()[1])
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch', type=int, default=4096)
+    parser.add_argument('--max-delay-ms', type=float, default=2.0)
+    parser.add_argument('--cache-size', type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    def ready(port):
+        print(f"Pricing service listening on http://{args.host}:{port}", flush=True)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_batch, args.max_delay_ms / 1000, args.cache_size, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,93 +1,130 @@
 import numpy as np
-from src.option_pricer import black_scholes
+from src.portfolio import Portfolio
+
+
+# Strategy factories: each returns a one-position Portfolio. Positive quantities are long,
+# and `quantity` scales the whole structure.
+
+def long_call(K, T, quantity=1):
+    return Portfolio.from_legs([('call', K, T, quantity)])
+
+
+def long_put(K, T, quantity=1):
+    return Portfolio.from_legs([('put', K, T, quantity)])
+
+
+def short_call(K, T, quantity=1):
+    return Portfolio.from_legs([('call', K, T, -quantity)])
+
+
+def short_put(K, T, quantity=1):
+    return Portfolio.from_legs([('put', K, T, -quantity)])
+
+
+def covered_call(K, T, quantity=1):
+    # Long stock + short call
+    return Portfolio.from_legs([('stock', None, None, quantity), ('call', K, T, -quantity)])
+
+
+def protective_put(K, T, quantity=1):
+    # Long stock + long put
+    return Portfolio.from_legs([('stock', None, None, quantity), ('put', K, T, quantity)])
+
+
+def cash_secured_put(K, T, quantity=1):
+    # Short put with cash set aside for assignment
+    return Portfolio.from_legs([('put', K, T, -quantity)])
+
+
+def bull_call_spread(K1, K2, T, quantity=1):
+    # Buy call at K1, sell call at K2
+    return Portfolio.from_legs([('call', K1, T, quantity), ('call', K2, T, -quantity)])
+
+
+def bear_put_spread(K1, K2, T, quantity=1):
+    # Buy put at K1, sell put at K2
+    return Portfolio.from_legs([('put', K1, T, quantity), ('put', K2, T, -quantity)])
+
+
+def iron_condor(K1, K2, K3, K4, T, quantity=1):
+    # Sell call at K2, buy call at K3; sell put at K1, buy put at K4
+    return Portfolio.from_legs([('call', K2, T, -quantity), ('call', K3, T, quantity),
+                                ('put', K1, T, -quantity), ('put', K4, T, quantity)])
+
+
+def iron_butterfly(K1, K2, K3, T, quantity=1):
+    # Short straddle (short call at K2, short put at K2) + long wings (buy call at K3, buy put at K1)
+    return Portfolio.from_legs([('call', K2, T, -quantity), ('put', K2, T, -quantity),
+                                ('call', K3, T, quantity), ('put', K1, T, quantity)])
+
+
+def butterfly_spread(K1, K2, K3, T, quantity=1):
+    # Buy call at K1, sell 2 calls at K2, buy call at K3
+    return Portfolio.from_legs([('call', K1, T, quantity), ('call', K2, T, -2 * quantity),
+                                ('call', K3, T, quantity)])
+
+
+def straddle(K, T, quantity=1):
+    # Buy a call and a put at the same strike
+    return Portfolio.from_legs([('call', K, T, quantity), ('put', K, T, quantity)])
+
+
+def strangle(K_put, K_call, T, quantity=1):
+    # Buy a put at K_put, buy a call at K_call
+    return Portfolio.from_legs([('call', K_call, T, quantity), ('put', K_put, T, quantity)])
+
+
+SINGLE_LEG_STRATEGIES = {
+    'long_call': long_call,
+    'long_put': long_put,
+    'short_call': short_call,
+    'short_put': short_put,
+    'covered_call': covered_call,
+    'protective_put': protective_put,
+    'cash_secured_put': cash_secured_put,
+}
+
+# Maps the K1..K4 arguments of multi_leg_strategy onto each factory
+MULTI_LEG_STRATEGIES = {
+    'bull_call_spread': lambda K1, K2, K3, K4, T: bull_call_spread(K1, K2, T),
+    'bear_put_spread': lambda K1, K2, K3, K4, T: bear_put_spread(K1, K2, T),
+    'iron_condor': lambda K1, K2, K3, K4, T: iron_condor(K1, K2, K3, K4, T),
+    'iron_butterfly': lambda K1, K2, K3, K4, T: iron_butterfly(K1, K2, K3, T),
+    'butterfly_spread': lambda K1, K2, K3, K4, T: butterfly_spread(K1, K2, K3, T),
+    'straddle': lambda K1, K2, K3, K4, T: straddle(K1, T),
+    'strangle': lambda K1, K2, K3, K4, T: strangle(K1, K2, T),
+}
+
+
+def price_grid(S, width=50, points=100):
+    """Stock price grid centred on S used for payoff graphs."""
+    return np.linspace(S - width, S + width, points)
+
+
+def _strategy_payoff(portfolio, S, r, sigma, prices):
+    # Premiums are priced once per leg, then the payoff is one array expression over the grid
+    return portfolio.with_premiums(S, r, sigma).payoff(prices)[0]
+
 
 # Single-leg strategy function
-def single_leg_strategy(S, K, T, r, sigma, option_type, strategy):
-    prices = np.linspace(S - 50, S + 50, 100)  # Stock price range for the graph
-    payouts = []
-
-    for price in prices:
-        if strategy == 'long_call':
-            payoff = max(price - K, 0) - black_scholes(S, K, T, r, sigma, 'call')
-        elif strategy == 'long_put':
-            payoff = max(K - price, 0) - black_scholes(S, K, T, r, sigma, 'put')
-        elif strategy == 'short_call':
-            payoff = black_scholes(S, K, T, r, sigma, 'call') - max(price - K, 0)
-        elif strategy == 'short_put':
-            payoff = black_scholes(S, K, T, r, sigma, 'put') - max(K - price, 0)
-        elif strategy == 'covered_call':
-            call_price = black_scholes(S, K, T, r, sigma, 'call')
-            payoff = price - call_price  # Covered call = stock - call option
-        elif strategy == 'protective_put':
-            put_price = black_scholes(S, K, T, r, sigma, 'put')
-            payoff = price - put_price  # Protective put = stock - put option
-        elif strategy == 'cash_secured_put':
-            put_price = black_scholes(S, K, T, r, sigma, 'put')
-            payoff = -put_price  # You get the premium, so payoff is negative cost
-        else:
-            return [], [], "Strategy not found."
-
-        payouts.append(payoff)
+def single_leg_strategy(S, K, T, r, sigma, option_type, strategy, prices=None, grid_width=50, grid_points=100):
+    if strategy not in SINGLE_LEG_STRATEGIES:
+        return [], [], "Strategy not found."
+
+    if prices is None:
+        prices = price_grid(S, grid_width, grid_points)  # Stock price range for the graph
+    payouts = _strategy_payoff(SINGLE_LEG_STRATEGIES[strategy](K, T), S, r, sigma, prices)
 
     return prices, payouts, f"{strategy.replace('_', ' ').title()}: Expected payoff as stock price changes."
 
 
 # Multi-leg strategy function
-def multi_leg_strategy(S, K1, K2, K3, K4, T, r, sigma, strategy):
-    prices = np.linspace(S - 50, S + 50, 100)  # Stock price range for the graph
-    payouts = []
-
-    for price in prices:
-        if strategy == 'bull_call_spread':
-            # Buy call at K1, sell call at K2
-            long_call = max(price - K1, 0) - black_scholes(S, K1, T, r, sigma, 'call')
-            short_call = black_scholes(S, K2, T, r, sigma, 'call') - max(price - K2, 0)
-            payoff = long_call + short_call
-
-        elif strategy == 'bear_put_spread':
-            # Buy put at K1, sell put at K2
-            long_put = max(K1 - price, 0) - black_scholes(S, K1, T, r, sigma, 'put')
-            short_put = black_scholes(S, K2, T, r, sigma, 'put') - max(K2 - price, 0)
-            payoff = long_put + short_put
-
-        elif strategy == 'iron_condor':
-            # Sell call at K2, buy call at K3; sell put at K1, buy put at K4
-            short_call = black_scholes(S, K2, T, r, sigma, 'call') - max(price - K2, 0)
-            long_call = max(price - K3, 0) - black_scholes(S, K3, T, r, sigma, 'call')
-            short_put = black_scholes(S, K1, T, r, sigma, 'put') - max(K1 - price, 0)
-            long_put = max(K4 - price, 0) - black_scholes(S, K4, T, r, sigma, 'put')
-            payoff = short_call + long_call + short_put + long_put
-
-        elif strategy == 'iron_butterfly':
-            # Short straddle (short call at K2, short put at K2) + long wings (buy call at K3, buy put at K1)
-            short_call = black_scholes(S, K2, T, r, sigma, 'call') - max(price - K2, 0)
-            short_put = black_scholes(S, K2, T, r, sigma, 'put') - max(K2 - price, 0)
-            long_call = max(price - K3, 0) - black_scholes(S, K3, T, r, sigma, 'call')
-            long_put = max(K1 - price, 0) - black_scholes(S, K1, T, r, sigma, 'put')
-            payoff = short_call + short_put + long_call + long_put
-
-        elif strategy == 'butterfly_spread':
-            # Buy call at K1, sell 2 calls at K2, buy call at K3
-            long_call_low = max(price - K1, 0) - black_scholes(S, K1, T, r, sigma, 'call')
-            short_call = 2 * (black_scholes(S, K2, T, r, sigma, 'call') - max(price - K2, 0))
-            long_call_high = max(price - K3, 0) - black_scholes(S, K3, T, r, sigma, 'call')
-            payoff = long_call_low + short_call + long_call_high
-
-        elif strategy == 'straddle':
-            # Buy a call and a put at the same strike (K1)
-            long_call = max(price - K1, 0) - black_scholes(S, K1, T, r, sigma, 'call')
-            long_put = max(K1 - price, 0) - black_scholes(S, K1, T, r, sigma, 'put')
-            payoff = long_call + long_put
-
-        elif strategy == 'strangle':
-            # Buy a call at K2, buy a put at K1
-            long_call = max(price - K2, 0) - black_scholes(S, K2, T, r, sigma, 'call')
-            long_put = max(K1 - price, 0) - black_scholes(S, K1, T, r, sigma, 'put')
-            payoff = long_call + long_put
-
-        else:
-            return [], [], "Strategy not found."
-
-        payouts.append(payoff)
+def multi_leg_strategy(S, K1, K2, K3, K4, T, r, sigma, strategy, prices=None, grid_width=50, grid_points=100):
+    if strategy not in MULTI_LEG_STRATEGIES:
+        return [], [], "Strategy not found."
+
+    if prices is None:
+        prices = price_grid(S, grid_width, grid_points)  # Stock price range for the graph
+    payouts = _strategy_payoff(MULTI_LEG_STRATEGIES[strategy](K1, K2, K3, K4, T), S, r, sigma, prices)
 
     return prices, payouts, f"{strategy.replace('_', ' ').title()}: Expected payoff as stock price changes."
@@ -0,0 +1,37 @@
+import numpy as np
+from src.option_pricer import bs_kernel, KERNEL_OUTPUTS
+
+SURFACE_PARAMETERS = {
+    'S': 'Stock Price',
+    'K': 'Strike Price',
+    'T': 'Time to Expiry (Years)',
+    'r': 'Risk-Free Rate',
+    'sigma': 'Volatility',
+}
+
+
+def evaluate_surface(base, x_param, x_values, y_param, y_values, output='Price', option_type='call'):
+    """
+    Evaluates the price or a Greek over a grid of two Black-Scholes inputs in one broadcast call.
+
+    Parameters:
+    base (dict): Values for S, K, T, r and sigma; the two swept inputs are overridden.
+    x_param, y_param (str): Keys of SURFACE_PARAMETERS to sweep along columns and rows.
+    x_values, y_values (array-like): Grid values for each swept input.
+    output (str): One of KERNEL_OUTPUTS.
+    option_type (str): 'call' or 'put'.
+
+    Returns:
+    ndarray: Shape (len(y_values), len(x_values)).
+    """
+    if x_param not in SURFACE_PARAMETERS or y_param not in SURFACE_PARAMETERS:
+        raise ValueError(f"Surface axes must be chosen from {list(SURFACE_PARAMETERS)}.")
+    if x_param == y_param:
+        raise ValueError("Surface axes must be two different inputs.")
+    if output not in KERNEL_OUTPUTS:
+        raise ValueError(f"Unknown output '{output}'. Choose from {KERNEL_OUTPUTS}.")
+
+    params = {name: base[name] for name in SURFACE_PARAMETERS}
+    params[x_param] = np.asarray(x_values, dtype=float)[np.newaxis, :]
+    params[y_param] = np.asarray(y_values, dtype=float)[:, np.newaxis]
+    return bs_kernel(option_type=option_type, outputs=(output,), **params)[output]
@@ -0,0 +1,214 @@
+"""
+Parallel parameter sweeps of strategy backtests.
+
+A sweep is the Cartesian grid tickers x strikes x expiries x strategies. Price histories are
+copied once into shared memory, and worker processes attach to them rather than each
+receiving its own copy. Configurations are grouped into chunks with one ticker, expiry and
+strategy and many strikes, so each chunk is one vectorized backtest_portfolio call over all
+of its strikes.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from src import strategies as strategy_factories
+from src.backtest_utils import backtest_portfolio, _price_history, _window_volatility, TRADING_DAYS
+from src.portfolio import Portfolio
+
+# Per-process views of the shared price arrays, set by _attach
+_SHARED = {}
+
+RESULT_COLUMNS = ['Ticker', 'Strike', 'Expiry', 'Strategy', 'Total PnL', 'Max Drawdown', 'Sharpe', 'Final Value',
+                  'Rolls']
+
+# Named strategies a sweep can run: the src.strategies factories struck at a single K, (K, T)
+SWEEP_STRATEGIES = {
+    **strategy_factories.SINGLE_LEG_STRATEGIES,
+    'straddle': strategy_factories.straddle,
+}
+
+
+def _strategy_factory(strategy):
+    # Strategies are names from SWEEP_STRATEGIES, or picklable callables taking (K, T)
+    if callable(strategy):
+        return strategy
+    if strategy not in SWEEP_STRATEGIES:
+        raise ValueError(f"Unknown sweep strategy '{strategy}'. Choose from {sorted(SWEEP_STRATEGIES)} "
+                         "or pass a callable taking (K, T).")
+    return SWEEP_STRATEGIES[strategy]
+
+
+def strategy_name(strategy):
+    return strategy if isinstance(strategy, str) else getattr(strategy, '__name__', repr(strategy))
+
+
+def summarize_pnl(pnl):
+    """
+    Summary statistics of daily P&L paths along the first axis.
+
+    Returns:
+    dict: 'Total PnL', 'Max Drawdown' (as a positive amount) and annualized 'Sharpe',
+        one value per path.
+    """
+    cumulative = np.cumsum(pnl, axis=0)
+    drawdown = np.maximum.accumulate(np.maximum(cumulative, 0), axis=0) - cumulative
+    std = pnl.std(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, pnl.mean(axis=0) / std * np.sqrt(TRADING_DAYS), np.nan)
+    return {
+        'Total PnL': cumulative[-1] if len(cumulative) else np.zeros(pnl.shape[1:]),
+        'Max Drawdown': drawdown.max(axis=0) if len(drawdown) else np.zeros(pnl.shape[1:]),
+        'Sharpe': sharpe,
+    }
+
+
+def _share(arrays):
+    # Packs arrays end to end into one shared memory block; returns the block and offsets
+    offsets = np.cumsum([0] + [a.size for a in arrays])
+    dtype = arrays[0].dtype
+    block = shared_memory.SharedMemory(create=True, size=max(int(offsets[-1]) * dtype.itemsize, 1))
+    buffer = np.ndarray(int(offsets[-1]), dtype=dtype, buffer=block.buf)
+    for array, start in zip(arrays, offsets[:-1]):
+        buffer[start:start + array.size] = array
+    return block, offsets
+
+
+def _attach(close_name, dates_name, offsets, volatility_name=None):
+    close_block = shared_memory.SharedMemory(name=close_name)
+    dates_block = shared_memory.SharedMemory(name=dates_name)
+    total = int(offsets[-1])
+    _SHARED['blocks'] = (close_block, dates_block)  # Keep the mappings alive
+    _SHARED['close'] = np.ndarray(total, dtype=np.float64, buffer=close_block.buf)
+    _SHARED['dates'] = np.ndarray(total, dtype=np.int64, buffer=dates_block.buf)
+    _SHARED['offsets'] = offsets
+    if volatility_name is not None:
+        volatility_block = shared_memory.SharedMemory(name=volatility_name)
+        _SHARED['blocks'] += (volatility_block,)
+        _SHARED['volatility'] = np.ndarray(total, dtype=np.float64, buffer=volatility_block.buf)
+
+
+def _detach():
+    # Drop the array views before closing, since open views keep the mapping exported
+    blocks = _SHARED.get('blocks', ())
+    _SHARED.clear()
+    for block in blocks:
+        block.close()
+
+
+def _run_chunk(ticker_index, strikes, expiry, strategy, backtest_kwargs):
+    start, stop = _SHARED['offsets'][ticker_index], _SHARED['offsets'][ticker_index + 1]
+    close = _SHARED['close'][start:stop]
+    dates = pd.DatetimeIndex(_SHARED['dates'][start:stop].view('datetime64[ns]'))
+
+    if 'volatility' in _SHARED:
+        backtest_kwargs = {**backtest_kwargs, 'volatility': _SHARED['volatility'][start:stop]}
+
+    factory = _strategy_factory(strategy)
+    portfolio = Portfolio.concat([factory(strike, expiry) for strike in strikes])
+    result = backtest_portfolio(dates, close, portfolio, **backtest_kwargs)
+    summary = summarize_pnl(result['position_pnl'])
+    summary['Final Value'] = result['value'][-1] if len(close) else np.full(len(strikes), np.nan)
+    summary['Rolls'] = np.full(len(strikes), int(result['roll'].sum()))
+    return summary
+
+
+def run_sweep(price_data, strikes, expiries, strategies, start_date, end_date, r=0.05, volatility=0.2,
+              roll_days=None, relative_strikes=True, max_workers=None, chunk_size=256, progress=True):
+    """
+    Backtests every combination of tickers, strikes, expiries and strategies.
+
+    Parameters:
+    price_data (dict): Ticker -> OHLCV DataFrame (date index or 'Date' column) as returned by
+        get_stock_data.
+    strikes (iterable of float): Strikes, as multiples of spot at each roll when
+        relative_strikes is True (e.g. 0.95, 1.0, 1.05), else absolute.
+    expiries (iterable of float): Tenors in years.
+    strategies (iterable): Names from SWEEP_STRATEGIES, such as 'long_call', 'short_put' or
+        'straddle', or picklable callables taking (K, T). Multi-strike strategies need a
+        callable that places the other strikes.
+    start_date, end_date (str): Backtest window.
+    r, volatility, roll_days: See backtest_portfolio. volatility must be a number or 'realized'.
+    max_workers (int, optional): Process count; defaults to every core. 1 runs in-process.
+    chunk_size (int): Maximum strikes per scheduled task.
+    progress (bool or callable): Print progress to stderr, or call progress(done, total).
+
+    Returns:
+    pd.DataFrame: One row per configuration with RESULT_COLUMNS (Total PnL, Max Drawdown,
+        Sharpe, Final Value and Rolls); empty when there are no tickers.
+    """
+    tickers = list(price_data)
+    strikes = [float(k) for k in strikes]
+    expiries = [float(t) for t in expiries]
+    strategies = list(strategies)
+    for strategy in strategies:
+        _strategy_factory(strategy)
+    if not tickers:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    histories = [_price_history(price_data[ticker], start_date, end_date) for ticker in tickers]
+    close_block, offsets = _share([np.ascontiguousarray(close, dtype=np.float64) for _, close in histories])
+    dates_block, _ = _share([dates.values.astype('datetime64[ns]').view(np.int64) for dates, _ in histories])
+    blocks = [close_block, dates_block]
+    volatility_name = None
+    if isinstance(volatility, str) and volatility == 'realized':
+        # Estimated on each ticker's full history before the window is cut, then shared like close
+        volatility_block, _ = _share([np.asarray(_window_volatility(price_data[ticker], start_date, end_date,
+                                                                    volatility), dtype=np.float64)
+                                      for ticker in tickers])
+        blocks.append(volatility_block)
+        volatility_name = volatility_block.name
+
+    backtest_kwargs = {'r': r, 'volatility': volatility, 'roll_days': roll_days,
+                       'relative_strikes': relative_strikes}
+    tasks = [(t, strikes[i:i + chunk_size], expiry, strategy)
+             for t in range(len(tickers)) for expiry in expiries for strategy in strategies
+             for i in range(0, len(strikes), chunk_size)]
+    total = len(tickers) * len(strikes) * len(expiries) * len(strategies)
+
+    report = progress if callable(progress) else None
+    if progress is True:
+        started = time.perf_counter()
+
+        def report(done, total):
+            rate = done / max(time.perf_counter() - started, 1e-9)
+            print(f"\r{done}/{total} configurations ({rate:.0f}/s)", end='' if done < total else '\n',
+                  file=sys.stderr, flush=True)
+
+    rows = []
+
+    def collect(task, summary):
+        ticker_index, chunk_strikes, expiry, strategy = task
+        for i, strike in enumerate(chunk_strikes):
+            row = {'Ticker': tickers[ticker_index], 'Strike': strike, 'Expiry': expiry,
+                   'Strategy': strategy_name(strategy)}
+            row.update({name: values[i] for name, values in summary.items()})
+            rows.append(row)
+        if report is not None:
+            report(len(rows), total)
+
+    try:
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers == 1:
+            _attach(close_block.name, dates_block.name, offsets, volatility_name)
+            for task in tasks:
+                collect(task, _run_chunk(*task, backtest_kwargs))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach,
+                                     initargs=(close_block.name, dates_block.name, offsets, volatility_name)) as pool:
+                futures = {pool.submit(_run_chunk, *task, backtest_kwargs): task for task in tasks}
+                for future in as_completed(futures):
+                    collect(futures[future], future.result())
+    finally:
+        _detach()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return (pd.DataFrame(rows, columns=RESULT_COLUMNS)
+            .sort_values(['Ticker', 'Strategy', 'Expiry', 'Strike'], kind='stable')
+            .reset_index(drop=True))
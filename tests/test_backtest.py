@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest_utils import backtest_portfolio, realized_volatility, _daily_input
+from src.option_pricer import black_scholes
+from src.portfolio import Portfolio
+
+DATES = pd.date_range('2021-01-01', periods=60, freq='D')
+CLOSE = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.01, DATES.size)))
+ELAPSED = np.arange(DATES.size) / 365
+
+
+def test_one_cycle_matches_black_scholes():
+    portfolio = Portfolio.from_legs([('call', 100, 1.0, 1), ('put', 95, 1.0, -2)])
+    result = backtest_portfolio(DATES, CLOSE, portfolio, r=0.03, volatility=0.25)
+    expected = (black_scholes(CLOSE, 100, 1.0 - ELAPSED, 0.03, 0.25, 'call')
+                - 2 * black_scholes(CLOSE, 95, 1.0 - ELAPSED, 0.03, 0.25, 'put'))
+    assert not result['roll'].any()
+    np.testing.assert_allclose(result['value'][:, 0], expected)
+    np.testing.assert_allclose(result['pnl'][1:], np.diff(expected))
+    np.testing.assert_allclose(result['time_to_expiry'], 1.0 - ELAPSED)
+
+
+def test_expired_leg_is_held_at_intrinsic_until_roll():
+    portfolio = Portfolio.from_legs([('put', 105, 10 / 365, 1)])
+    value = backtest_portfolio(DATES, CLOSE, portfolio, volatility=0.25, roll_days=30)['value'][:, 0]
+    np.testing.assert_allclose(value[:10], black_scholes(CLOSE[:10], 105, (10 - np.arange(10)) / 365,
+                                                         0.05, 0.25, 'put'))
+    np.testing.assert_allclose(value[10:30], max(105 - CLOSE[10], 0))
+    assert value[30] == pytest.approx(black_scholes(CLOSE[30], 105, 10 / 365, 0.05, 0.25, 'put'))
+
+
+def test_pnl_on_roll_date_closes_out_the_old_position():
+    portfolio = Portfolio.from_legs([('call', 100, 20 / 365, 1)])
+    result = backtest_portfolio(DATES, CLOSE, portfolio, volatility=0.25, roll_days=10)
+    assert np.flatnonzero(result['roll']).tolist() == [10, 20, 30, 40, 50]
+    closed_out = black_scholes(CLOSE[10], 100, 10 / 365, 0.05, 0.25, 'call')
+    assert result['pnl'][10] == pytest.approx(closed_out - result['value'][9, 0])
+    assert result['value'][10, 0] == pytest.approx(black_scholes(CLOSE[10], 100, 20 / 365, 0.05, 0.25, 'call'))
+
+
+def test_realized_volatility_uses_no_later_returns():
+    vol = realized_volatility(CLOSE)
+    changed = CLOSE.copy()
+    changed[30:] *= 1.5
+    np.testing.assert_array_equal(realized_volatility(changed)[:30], vol[:30])
+    assert vol[0] == vol[1] == 0.2
+    log_returns = np.diff(np.log(CLOSE))
+    assert vol[5] == pytest.approx(np.std(log_returns[:5], ddof=1) * np.sqrt(252))
+
+
+def test_daily_series_must_cover_the_first_date():
+    series = pd.Series(0.3, index=DATES[5:])
+    with pytest.raises(ValueError):
+        _daily_input(series, DATES, CLOSE)
+    np.testing.assert_array_equal(_daily_input(pd.Series([0.1, 0.3], index=DATES[[0, 5]]), DATES, CLOSE)[:7],
+                                  [0.1] * 5 + [0.3] * 2)
+
+
+def test_stock_only_portfolio_is_not_rolled():
+    result = backtest_portfolio(DATES, CLOSE, Portfolio.from_legs([('stock', None, None, 2)]))
+    assert not result['roll'].any()
+    np.testing.assert_allclose(result['value'][:, 0], 2 * CLOSE)
+    np.testing.assert_allclose(result['pnl'][1:], 2 * np.diff(CLOSE))
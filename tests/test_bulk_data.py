@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.bulk_data import load_universe, ColumnarStore
+from src.data import PriceCache, csv_fetcher
+
+
+@pytest.fixture
+def cache(tmp_path):
+    rows = [('AAA', '2020-01-02', 10.0), ('AAA', '2020-01-03', 11.0), ('AAA', '2020-01-07', 12.0),
+            ('BBB', '2020-01-03', 20.0), ('BBB', '2020-01-06', 21.0), ('BBB', '2020-01-07', 22.0)]
+    path = tmp_path / 'prices.csv'
+    pd.DataFrame(rows, columns=['Ticker', 'Date', 'Close']).to_csv(path, index=False)
+    return PriceCache(str(tmp_path / 'cache'), csv_fetcher(str(path)))
+
+
+def test_aligns_tickers_on_the_union_of_dates(cache, tmp_path):
+    with pytest.warns(UserWarning, match='Failed to load ZZZ: no data'):
+        store = load_universe(['AAA', 'BBB', 'AAA', 'ZZZ'], '2020-01-01', '2020-02-01', str(tmp_path / 'store'),
+                              cache=cache, group_size=2)
+    assert store.tickers == ['AAA', 'BBB']
+    assert store.failed == ['ZZZ']
+    np.testing.assert_array_equal(store.dates, np.array(['2020-01-02', '2020-01-03', '2020-01-06', '2020-01-07'],
+                                                        dtype='datetime64[D]'))
+    np.testing.assert_array_equal(store.matrix(), [[10, 11, np.nan, 12], [np.nan, 20, 21, 22]])
+
+    reopened = ColumnarStore(str(tmp_path / 'store'))
+    np.testing.assert_array_equal(reopened.close('BBB'), [np.nan, 20, 21, 22])
+    with pytest.raises(KeyError):
+        reopened.matrix('Volume')
+
+
+def test_frame_slices_dates_and_drops_gaps(cache, tmp_path):
+    store = load_universe(['AAA', 'BBB'], '2020-01-01', '2020-02-01', str(tmp_path / 'store'), cache=cache)
+    frame = store.frame('AAA', '2020-01-03', '2020-01-08')
+    assert frame.index.name == 'Date'
+    assert list(frame.index) == [pd.Timestamp('2020-01-03'), pd.Timestamp('2020-01-07')]
+    assert frame['Close'].tolist() == [11, 12]
+    assert len(store.frame('BBB')) == 3
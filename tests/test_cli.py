@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cli import main
+from src.option_pricer import bs_kernel
+
+
+@pytest.fixture
+def contracts(tmp_path):
+    path = tmp_path / 'contracts.csv'
+    pd.DataFrame({'spot': [100.0, 90.0, 110.0], 'K': [100.0, 95.0, 105.0], 'T': [1.0, 0.5, 0.25],
+                  'vol': [0.2, 0.3, 0.25], 'option_type': ['call', 'put', 'call']}).to_csv(path, index=False)
+    return path
+
+
+def test_prices_a_csv_into_parquet(contracts, tmp_path):
+    output = tmp_path / 'priced.parquet'
+    assert main([str(contracts), str(output), '--columns', 'S=spot,sigma=vol', '--outputs', 'Price,Delta',
+                 '--rate', '0.03', '--chunk-size', '2', '--quiet']) == 0
+
+    priced = pd.read_parquet(output)
+    assert list(priced.columns) == ['spot', 'K', 'T', 'vol', 'option_type', 'Price', 'Delta']
+    expected = bs_kernel(priced['spot'], priced['K'], priced['T'], 0.03, priced['vol'],
+                         priced['option_type'].to_numpy(), ('Price', 'Delta'))
+    np.testing.assert_allclose(priced['Price'], expected['Price'])
+    np.testing.assert_allclose(priced['Delta'], expected['Delta'])
+
+
+@pytest.mark.parametrize('arguments', [
+    ['--outputs', 'Price,Speed'],
+    ['--columns', 'spot=S'],
+])
+def test_invalid_arguments_exit_with_usage_error(contracts, tmp_path, arguments):
+    with pytest.raises(SystemExit) as exc:
+        main([str(contracts), str(tmp_path / 'priced.csv'), '--quiet', *arguments])
+    assert exc.value.code == 2
+
+
+def test_missing_input_is_a_usage_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main([str(tmp_path / 'missing.csv'), str(tmp_path / 'priced.csv'), '--quiet'])
+    assert exc.value.code == 2
+    assert 'does not exist' in capsys.readouterr().err
@@ -0,0 +1,122 @@
+import os
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import PriceCache, yahoo_many_fetcher
+
+
+class _Fetcher:
+    # One row per calendar day, recording every call
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, ticker, start, end):
+        self.calls.append((ticker, start, end))
+        dates = pd.date_range(start, end, freq='D', inclusive='left', name='Date')
+        return pd.DataFrame({'Close': range(len(dates))}, index=dates, dtype=float)
+
+
+def test_serves_cached_ranges(tmp_path):
+    fetcher = _Fetcher()
+    cache = PriceCache(str(tmp_path), fetcher)
+    assert len(cache.get('AAA', '2020-01-01', '2020-02-01')) == 31
+    assert len(cache.get('AAA', '2020-01-10', '2020-01-20')) == 10
+    assert len(fetcher.calls) == 1
+
+
+def test_refetches_when_file_is_missing(tmp_path):
+    fetcher = _Fetcher()
+    cache = PriceCache(str(tmp_path), fetcher)
+    cache.get('AAA', '2020-01-01', '2020-02-01')
+    os.remove(tmp_path / 'AAA.parquet')
+
+    # Both the in-memory index and a fresh cache reading the on-disk index still list the range
+    assert len(cache.get('AAA', '2020-01-01', '2020-02-01')) == 31
+    os.remove(tmp_path / 'AAA.parquet')
+    fresh = PriceCache(str(tmp_path), fetcher)
+    assert len(fresh.get('AAA', '2020-01-01', '2020-02-01')) == 31
+    assert len(fetcher.calls) == 3
+    assert fresh.size() == os.path.getsize(tmp_path / 'AAA.parquet')
+
+
+def test_refetches_when_file_is_corrupt(tmp_path):
+    fetcher = _Fetcher()
+    cache = PriceCache(str(tmp_path), fetcher)
+    cache.get('AAA', '2020-01-01', '2020-02-01')
+    (tmp_path / 'AAA.parquet').write_text('not parquet')
+    assert len(cache.get('AAA', '2020-01-01', '2020-02-01')) == 31
+    assert len(fetcher.calls) == 2
+
+
+class _BusinessDayFetcher(_Fetcher):
+    # One row per weekday, so weekend-only ranges come back empty
+    def __call__(self, ticker, start, end):
+        self.calls.append((ticker, start, end))
+        dates = pd.bdate_range(start, end, inclusive='left', name='Date')
+        return pd.DataFrame({'Close': range(len(dates))}, index=dates, dtype=float)
+
+
+def test_does_not_refetch_empty_ranges(tmp_path):
+    fetcher = _BusinessDayFetcher()
+    cache = PriceCache(str(tmp_path), fetcher)
+    assert len(cache.get('AAA', '2020-01-06', '2020-01-11')) == 5
+    for _ in range(3):
+        assert len(cache.get('AAA', '2020-01-06', '2020-01-13')) == 5
+    assert fetcher.calls == [('AAA', '2020-01-06', '2020-01-11'), ('AAA', '2020-01-11', '2020-01-13')]
+
+
+def test_does_not_record_failed_fetches(tmp_path):
+    fetcher = _BusinessDayFetcher()
+    cache = PriceCache(str(tmp_path), fetcher)
+
+    def failing(ticker, start, end):
+        raise RuntimeError('rate limited')
+
+    cache.fetcher = failing
+    with pytest.raises(RuntimeError):
+        cache.get('AAA', '2020-01-06', '2020-01-11')
+    cache.fetcher = fetcher
+    assert len(cache.get('AAA', '2020-01-06', '2020-01-11')) == 5
+    assert len(fetcher.calls) == 1
+
+
+def test_get_many_fetches_shared_gaps_together(tmp_path):
+    calls = []
+    single = _BusinessDayFetcher()
+
+    def many(tickers, start, end):
+        calls.append((list(tickers), start, end))
+        return {ticker: RuntimeError('delisted') if ticker == 'BAD' else single(ticker, start, end)
+                for ticker in tickers}
+
+    cache = PriceCache(str(tmp_path), single, many_fetcher=many)
+    results = cache.get_many(['AAA', 'BBB', 'BAD'], '2020-01-06', '2020-01-11')
+    assert len(results['AAA']) == len(results['BBB']) == 5
+    assert isinstance(results['BAD'], RuntimeError)
+
+    # Only the failed ticker is fetched again
+    results = cache.get_many(['AAA', 'BBB', 'BAD'], '2020-01-06', '2020-01-11')
+    assert len(results['AAA']) == 5
+    with pytest.raises(RuntimeError):
+        cache.get('BAD', '2020-01-06', '2020-01-11')
+    assert calls == [(['AAA', 'BBB', 'BAD'], '2020-01-06', '2020-01-11'),
+                     (['BAD'], '2020-01-06', '2020-01-11'), (['BAD'], '2020-01-06', '2020-01-11')]
+
+
+def test_yahoo_many_fetcher_splits_a_group_download(monkeypatch):
+    dates = pd.DatetimeIndex(['2020-01-06', '2020-01-07'])
+    data = pd.DataFrame({('AAA', 'Close'): [1.0, 2.0], ('BBB', 'Close'): [np.nan, 3.0]}, index=dates)
+    errors = {'CCC': "YFPricesMissingError('possibly delisted; no price data found')",
+              'DDD': "YFRateLimitError('Too Many Requests')"}
+    fake = types.SimpleNamespace(download=lambda *args, **kwargs: data, shared=types.SimpleNamespace(_ERRORS=errors))
+    monkeypatch.setitem(sys.modules, 'yfinance', fake)
+
+    results = yahoo_many_fetcher(['aaa', 'BBB', 'CCC', 'DDD'], '2020-01-06', '2020-01-08')
+    assert results['aaa']['Close'].tolist() == [1.0, 2.0]
+    assert results['BBB'].index.tolist() == [pd.Timestamp('2020-01-07')]
+    assert len(results['CCC']) == 0
+    assert isinstance(results['DDD'], RuntimeError)
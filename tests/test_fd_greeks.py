@@ -0,0 +1,31 @@
+import warnings
+
+import numpy as np
+
+from src.fd_greeks import finite_difference_greeks
+from src.lattice import lattice_price
+from src.option_pricer import bs_kernel, black_scholes, FIRST_ORDER_OUTPUTS
+
+
+def test_matches_closed_form():
+    S, K, T = 100, np.array([80.0, 100.0, 120.0]), np.array([0.25, 1.0, 2.0])
+    expected = bs_kernel(S, K, T, 0.05, 0.2, 'put', FIRST_ORDER_OUTPUTS)
+    greeks = finite_difference_greeks(black_scholes, S, K, T, 0.05, 0.2, 'put')
+    for name in FIRST_ORDER_OUTPUTS:
+        np.testing.assert_allclose(greeks[name], expected[name], rtol=2e-3, atol=2e-4)
+
+
+def test_smoothed_lattice_gamma():
+    greeks = finite_difference_greeks(lattice_price, 100, 100, 1, 0.05, 0.2, 'call', outputs=('Gamma',),
+                                      n_steps=200, smooth=True)
+    assert abs(greeks['Gamma'] - bs_kernel(100, 100, 1, 0.05, 0.2, 'call', ('Gamma',))['Gamma']) < 5e-4
+
+
+def test_expired_contracts_have_no_time_decay():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        greeks = finite_difference_greeks(lattice_price, 100, [90, 110], 0, 0.05, 0.2, 'call',
+                                          outputs=('Price', 'Theta', 'Charm'), smooth=True)
+    np.testing.assert_array_equal(greeks['Price'], [10, 0])
+    np.testing.assert_array_equal(greeks['Theta'], 0)
+    np.testing.assert_array_equal(greeks['Charm'], 0)
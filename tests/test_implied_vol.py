@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.implied_vol import (implied_volatility, implied_volatility_chain, CONVERGED, NO_VEGA, OUT_OF_BOUNDS,
+                             STATUS_LABELS)
+from src.option_pricer import black_scholes
+
+
+def _random_chain(n, seed=0):
+    rng = np.random.default_rng(seed)
+    # Wide enough to reach prices that underflow towards subnormal numbers
+    S = rng.uniform(20, 200, n)
+    K = rng.uniform(20, 200, n)
+    T = rng.uniform(0.01, 3, n)
+    sigma = rng.uniform(0.01, 2, n)
+    is_call = rng.random(n) < 0.5
+    price = black_scholes(S, K, T, 0.05, sigma, np.where(is_call, 'call', 'put'))
+    return price, S, K, T, sigma, is_call
+
+
+@pytest.mark.parametrize('sigma_tol', [1e-6, 1e-4, 1e-2])
+def test_round_trip_converged_within_sigma_tol(sigma_tol):
+    # black_scholes -> implied_volatility: every converged result must recover the volatility
+    price, S, K, T, sigma, is_call = _random_chain(100_000)
+    result = implied_volatility(price, S, K, T, 0.05, is_call, sigma_tol=sigma_tol)
+    converged = result['Status'] == CONVERGED
+    assert np.all(np.isin(result['Status'], [CONVERGED, NO_VEGA]))
+    assert converged.mean() > 0.95
+    assert np.max(np.abs(result['Implied Volatility'][converged] - sigma[converged])) <= sigma_tol
+    assert np.all(np.isnan(result['Implied Volatility'][~converged]))
+
+
+def test_deep_in_the_money_is_not_identified():
+    # Prices within tol from sigma 0.088 up to about 0.3, so no volatility should be reported
+    price = black_scholes(100, 53.87, 0.13, 0.05, 0.088, 'call')
+    result = implied_volatility(price, 100, 53.87, 0.13, 0.05, 'call')
+    assert result['Status'] == NO_VEGA
+    assert np.isnan(result['Implied Volatility'])
+
+
+def test_at_the_money_converges_to_full_precision():
+    price = black_scholes(100, 100, 1, 0.05, 0.2, 'put')
+    result = implied_volatility(price, 100, 100, 1, 0.05, 'put')
+    assert result['Status'] == CONVERGED
+    assert result['Implied Volatility'] == pytest.approx(0.2, abs=1e-10)
+
+
+def test_out_of_bounds():
+    result = implied_volatility([-1.0, 200.0, 5.0], 100, 100, [1, 1, 0], 0.05, 'call')
+    np.testing.assert_array_equal(result['Status'], OUT_OF_BOUNDS)
+    assert np.all(np.isnan(result['Implied Volatility']))
+
+
+def test_chain_labels():
+    chain = pd.DataFrame({
+        'Price': [black_scholes(100, 100, 0.5, 0.05, 0.3, 'call'), black_scholes(100, 53.87, 0.13, 0.05, 0.088, 'call')],
+        'Strike': [100, 53.87],
+        'Expiry': [0.5, 0.13],
+        'Type': ['call', 'call'],
+    })
+    result = implied_volatility_chain(chain, 100, 0.05)
+    assert list(result['Status']) == [STATUS_LABELS[CONVERGED], STATUS_LABELS[NO_VEGA]]
+    assert result['Implied Volatility'].iloc[0] == pytest.approx(0.3, abs=1e-10)
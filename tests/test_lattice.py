@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from src.lattice import lattice_price
+from src.option_pricer import black_scholes
+
+
+@pytest.mark.parametrize('method', ['binomial', 'trinomial'])
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+def test_european_matches_black_scholes(method, option_type):
+    K, T = np.array([80.0, 100.0, 120.0]), np.array([0.25, 1.0, 2.0])
+    prices = lattice_price(100, K, T, 0.05, 0.2, option_type, american=False, n_steps=400, method=method,
+                           richardson=True)
+    np.testing.assert_allclose(prices, black_scholes(100, K, T, 0.05, 0.2, option_type), atol=2e-3)
+
+
+def test_american_put_exceeds_european():
+    american = lattice_price(100, 110, 1, 0.05, 0.2, 'put', n_steps=200)
+    assert american > black_scholes(100, 110, 1, 0.05, 0.2, 'put') + 0.1
+
+
+def test_rejects_invalid_probabilities():
+    with pytest.raises(ValueError, match=r'contracts \[1\]'):
+        lattice_price(100, 100, 1, [0.05, 0.5], 0.05, 'call', n_steps=10, american=False)
+    with pytest.raises(ValueError, match='sigma > 0'):
+        lattice_price(100, 100, 1, 0.05, 0.0, 'call')
+    # Enough steps make the same contract valid
+    price = lattice_price(100, 100, 1, 0.5, 0.05, 'call', n_steps=2000, american=False)
+    assert abs(price - black_scholes(100, 100, 1, 0.5, 0.05, 'call')) < 1e-2
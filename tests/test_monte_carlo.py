@@ -0,0 +1,35 @@
+import pytest
+
+from src.monte_carlo import monte_carlo_price
+from src.option_pricer import black_scholes
+
+
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+def test_european_matches_black_scholes(option_type):
+    result = monte_carlo_price(100, 105, 1, 0.05, 0.2, option_type, n_paths=200_000, control_variate=False,
+                               seed=1)
+    assert abs(result['Price'] - black_scholes(100, 105, 1, 0.05, 0.2, option_type)) < 4 * result['Std Error']
+    assert result['Paths'] == 200_000
+
+
+def test_in_and_out_barriers_add_up_to_european():
+    kwargs = dict(payoff='barrier', barrier=120, n_paths=20_000, n_steps=50, chunk_size=7_000,
+                  control_variate=False, seed=3)
+    knock_in = monte_carlo_price(100, 100, 1, 0.05, 0.2, barrier_type='up-and-in', **kwargs)
+    knock_out = monte_carlo_price(100, 100, 1, 0.05, 0.2, barrier_type='up-and-out', **kwargs)
+    european = monte_carlo_price(100, 100, 1, 0.05, 0.2, n_paths=20_000, n_steps=50, chunk_size=7_000,
+                                 control_variate=False, seed=3)
+    assert knock_in['Price'] + knock_out['Price'] == pytest.approx(european['Price'], rel=1e-12)
+
+
+def test_seed_gives_the_same_result_for_any_worker_count():
+    kwargs = dict(payoff='asian', n_paths=30_000, n_steps=20, chunk_size=10_000, seed=7)
+    serial = monte_carlo_price(100, 100, 1, 0.05, 0.2, 'put', max_workers=1, **kwargs)
+    parallel = monte_carlo_price(100, 100, 1, 0.05, 0.2, 'put', max_workers=2, **kwargs)
+    assert serial == parallel
+
+
+@pytest.mark.parametrize('kwargs', [{'n_paths': 0}, {'chunk_size': 0}])
+def test_rejects_empty_simulations(kwargs):
+    with pytest.raises(ValueError):
+        monte_carlo_price(100, 100, 1, 0.05, 0.2, **kwargs)
@@ -0,0 +1,71 @@
+import importlib.util
+
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from src import normal
+
+BACKENDS = [
+    'scipy',
+    pytest.param('numba', marks=pytest.mark.skipif(importlib.util.find_spec('numba') is None,
+                                                   reason='numba is not installed')),
+]
+
+# Deep into both tails, where the CDF underflows to 0 or rounds to 1
+GRID = np.concatenate([np.linspace(-40, 40, 20001), [-1e300, -1e10, 1e10, 1e300]])
+SPECIAL = np.array([-np.inf, np.inf, np.nan])
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    previous = normal.backend
+    normal.set_backend(request.param)
+    yield request.param
+    normal.set_backend(previous)
+
+
+def test_cdf_matches_scipy(backend):
+    np.testing.assert_allclose(normal.norm_cdf(GRID), norm.cdf(GRID), rtol=1e-12, atol=1e-300)
+
+
+def test_pdf_matches_scipy(backend):
+    with np.errstate(over='ignore'):  # x**2 overflows to inf for the extreme points, giving 0
+        np.testing.assert_allclose(normal.norm_pdf(GRID), norm.pdf(GRID), rtol=1e-12, atol=1e-300)
+
+
+def test_cdf_special_values(backend):
+    np.testing.assert_array_equal(normal.norm_cdf(SPECIAL), [0.0, 1.0, np.nan])
+
+
+def test_pdf_special_values(backend):
+    np.testing.assert_array_equal(normal.norm_pdf(SPECIAL), [0.0, 0.0, np.nan])
+
+
+def test_out_argument(backend):
+    x = np.linspace(-8, 8, 101)
+    out = np.empty_like(x)
+    assert normal.norm_cdf(x, out=out) is out
+    np.testing.assert_allclose(out, norm.cdf(x), rtol=1e-12, atol=1e-300)
+    out = x.copy()
+    assert normal.norm_pdf(out, out=out) is out  # In place, as the kernels call it
+    np.testing.assert_allclose(out, norm.pdf(x), rtol=1e-12, atol=1e-300)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        normal.set_backend('missing')
+
+
+@pytest.mark.parametrize('requested', ['missing', 'numba'])
+def test_unavailable_default_backend_falls_back_to_scipy(monkeypatch, requested):
+    if requested == 'numba' and importlib.util.find_spec('numba') is not None:
+        pytest.skip('numba is installed')
+    previous = normal.backend
+    monkeypatch.setenv('BSTOOL_NORMAL_BACKEND', requested)
+    try:
+        with pytest.warns(UserWarning, match=requested):
+            normal._select_default_backend()
+        assert normal.backend == 'scipy'
+    finally:
+        normal.set_backend(previous)
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from src.fd_greeks import finite_difference_greeks
+from src.option_pricer import bs_kernel, black_scholes, make_outputs, make_workspace, KERNEL_OUTPUTS
+
+
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+def test_kernel_outputs_match_finite_differences(option_type):
+    S, K, T = 100, np.array([80.0, 100.0, 120.0]), np.array([0.25, 1.0, 2.0])
+    expected = finite_difference_greeks(black_scholes, S, K, T, 0.05, 0.2, option_type, outputs=KERNEL_OUTPUTS,
+                                        bumps={'S': 1e-3, 'T': 1e-4})
+    values = bs_kernel(S, K, T, 0.05, 0.2, option_type, KERNEL_OUTPUTS)
+    for name in KERNEL_OUTPUTS:
+        np.testing.assert_allclose(values[name], expected[name], rtol=2e-3, atol=2e-5, err_msg=name)
+
+
+def test_kernel_writes_into_given_buffers():
+    S = np.linspace(80, 120, 7)
+    out = make_outputs(S.shape, KERNEL_OUTPUTS)
+    workspace = make_workspace(S.shape)
+    values = bs_kernel(S, 100, 0.5, 0.05, 0.2, 'put', KERNEL_OUTPUTS, out=out, workspace=workspace)
+    assert values is out
+    for name in KERNEL_OUTPUTS:
+        assert values[name] is out[name]
+
+    # Reusing the buffers for another market state overwrites every output
+    expected = bs_kernel(S * 1.1, 100, 0.5, 0.05, 0.3, 'call', KERNEL_OUTPUTS)
+    values = bs_kernel(S * 1.1, 100, 0.5, 0.05, 0.3, 'call', KERNEL_OUTPUTS, out=out, workspace=workspace)
+    for name in KERNEL_OUTPUTS:
+        assert values[name] is out[name]
+        np.testing.assert_array_equal(values[name], expected[name])
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from src.option_pricer import black_scholes, bs_kernel, FIRST_ORDER_OUTPUTS
+from src.portfolio import Portfolio, CALL, PUT, STOCK
+
+
+def test_concat_renumbers_positions():
+    first = Portfolio(['call', 'put', 'call'], [100, 95, 110], 1.0, position=[5, 5, 9])
+    second = Portfolio.from_legs([('stock', None, None, 1), ('put', 90, 0.5, 1)])
+    book = Portfolio.concat([first, second])
+    assert book.n_positions == 3
+    np.testing.assert_array_equal(book.position, [0, 0, 1, 2, 2])
+    np.testing.assert_array_equal(book.kind, [CALL, PUT, CALL, STOCK, PUT])
+
+
+def test_values_are_summed_per_position():
+    # Legs are given out of position order to exercise the grouping
+    book = Portfolio(['call', 'put', 'call'], [100, 95, 110], 1.0, quantity=[1, -2, 3], position=[0, 1, 0])
+    value = book.value(np.array([[100.0], [120.0]]), 0.05, 0.2)
+    for row, S in enumerate([100.0, 120.0]):
+        call, put, wing = (black_scholes(S, K, 1.0, 0.05, 0.2, kind) for K, kind in
+                           ((100, 'call'), (95, 'put'), (110, 'call')))
+        np.testing.assert_allclose(value[row], [call + 3 * wing, -2 * put])
+
+
+def test_expired_and_stock_legs():
+    book = Portfolio(['call', 'put', 'stock'], [100, 100, np.nan], [0.5, 1.0, 0.0])
+    values = book.leg_values(110.0, 0.05, 0.2, time_elapsed=0.75, outputs=FIRST_ORDER_OUTPUTS)
+    live = bs_kernel(110.0, 100, 0.25, 0.05, 0.2, 'put', FIRST_ORDER_OUTPUTS)
+    np.testing.assert_allclose(values['Price'], [10, live['Price'], 110])
+    np.testing.assert_allclose(values['Delta'], [0, live['Delta'], 1])
+    for name in ('Gamma', 'Vega', 'Theta', 'Rho'):
+        np.testing.assert_allclose(values[name], [0, live[name], 0])
+
+
+def test_payoff_deducts_premiums():
+    book = Portfolio(['call', 'put', 'stock'], [100, 90, np.nan], 1.0, quantity=[1, 2, -1],
+                     premium=[5, 1, 100], position=[0, 0, 1])
+    payoff = book.payoff([80.0, 100.0, 120.0])
+    np.testing.assert_allclose(payoff, [[-5 + 2 * (10 - 1), -5 - 2, 20 - 5 - 2], [20, 0, -20]])
+
+
+def test_rejects_unknown_instrument_codes():
+    with pytest.raises(ValueError, match='Invalid instrument codes'):
+        Portfolio([CALL, 7], [100, 100], 1.0)
+    with pytest.raises(ValueError, match='Invalid instrument'):
+        Portfolio(['call', 'future'], [100, 100], 1.0)
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.portfolio import Portfolio
+from src.scenarios import scenario_grid, scenario_pnl, worst_case
+from src.strategies import iron_condor, straddle, covered_call
+
+BOOK = Portfolio.concat([straddle(100, 0.5), iron_condor(85, 95, 105, 115, 0.25), covered_call(105, 1.0),
+                         straddle(100, 0.5)])
+GRID = scenario_grid(spot=[-0.2, -0.05, 0.0, 0.1], vol=[-0.05, 0.0, 0.1], days=[0, 7], rate=[0.0, 0.01])
+
+
+def _direct(S, r, sigma):
+    base = BOOK.value(S, r, sigma)
+    return np.array([BOOK.value(S * (1 + spot), r + rate, sigma + vol, days / 365) - base
+                     for spot, vol, days, rate in GRID.to_numpy()])
+
+
+@pytest.mark.parametrize('max_elements, max_workers', [(2 ** 16, 1), (7, 1), (7, 4)])
+def test_matches_direct_revaluation(max_elements, max_workers):
+    pnl = scenario_pnl(BOOK, 100.0, 0.03, 0.25, GRID, max_elements=max_elements, max_workers=max_workers)
+    assert pnl.shape == (len(GRID), BOOK.n_positions)
+    np.testing.assert_allclose(pnl, _direct(100.0, 0.03, 0.25), rtol=0, atol=1e-10)
+
+
+def test_rejects_missing_shocks():
+    with pytest.raises(ValueError, match='missing shocks'):
+        scenario_pnl(BOOK, 100.0, 0.03, 0.25, GRID.drop(columns='Rate Shock'))
+
+
+def test_worst_case_orders_scenarios():
+    pnl = np.array([[1.0, -4.0], [-3.0, 2.0], [-5.0, -1.0], [0.0, 0.0]])
+    frame = pd.DataFrame({'Spot Shock': [0.1, -0.1, -0.2, 0.0]}, index=list('abcd'))
+    summary = worst_case(pnl, frame, position_ids=['x', 'y'], n_worst=3)
+    assert list(summary['Book'].index) == ['c', 'a', 'b']
+    assert summary['Book']['Book PnL'].tolist() == [-6.0, -3.0, -1.0]
+    positions = summary['Positions']
+    assert positions.loc['x'].tolist() == [-5.0, 'c', 1.0]
+    assert positions.loc['y'].tolist() == [-4.0, 'a', 2.0]
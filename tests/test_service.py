@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+from src.service import serve
+
+
+async def _request(port, method, path, body=None, head=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    data = b'' if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode())
+    head = head or f"{method} {path} HTTP/1.1\r\nContent-Length: {len(data)}\r\nConnection: close\r\n\r\n"
+    writer.write(head.encode() + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    status_line, _, payload = response.partition(b'\r\n\r\n')
+    return int(status_line.split()[1]), json.loads(payload)
+
+
+async def _with_service(check, **kwargs):
+    bound = asyncio.get_running_loop().create_future()
+    server = asyncio.create_task(serve(port=0, ready=bound.set_result, **kwargs))
+    try:
+        return await check(await bound)
+    finally:
+        server.cancel()
+        await asyncio.gather(server, return_exceptions=True)
+
+
+def test_batches_concurrent_requests_and_caches_results():
+    async def check(port):
+        contracts = [{'S': 100, 'K': 80 + i, 'T': 1, 'sigma': 0.2} for i in range(20)]
+        responses = await asyncio.gather(*(_request(port, 'POST', '/price', c) for c in contracts))
+        repeat = await _request(port, 'POST', '/price', {'contracts': contracts[:3]})
+        return responses, repeat, await _request(port, 'GET', '/metrics')
+
+    responses, repeat, (_, metrics) = asyncio.run(_with_service(check, max_delay=0.05))
+    assert all(status == 200 for status, _ in responses)
+    assert [result['Price'] for result in repeat[1]['results']] == [body['Price'] for _, body in responses[:3]]
+    assert metrics['Requests'] == 21
+    assert metrics['Batches'] < metrics['Requests']
+    assert metrics['Cache Hits'] == 3
+
+
+def test_rejects_bad_requests_and_sends_nan_as_null():
+    async def check(port):
+        return await asyncio.gather(
+            _request(port, 'POST', '/price', b'{not json'),
+            _request(port, 'POST', '/price', {'S': 100, 'K': 100, 'T': 1, 'sigma': 0.2, 'option_type': 'swap'}),
+            _request(port, None, None, head="GARBAGE\r\n\r\n"),
+            _request(port, None, None, head="POST /price HTTP/1.1\r\nContent-Length: ten\r\n\r\n"),
+            _request(port, 'POST', '/price', {'S': 100, 'K': 100, 'T': 1, 'sigma': 0}),
+        )
+
+    bad_json, bad_type, bad_head, bad_length, zero_vol = asyncio.run(_with_service(check))
+    assert bad_json[0] == bad_type[0] == bad_head[0] == bad_length[0] == 400
+    assert 'option type' in bad_type[1]['error']
+    assert zero_vol[0] == 200
+    assert zero_vol[1]['Gamma'] is None
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from src.option_pricer import black_scholes
+from src.strategies import (single_leg_strategy, multi_leg_strategy, SINGLE_LEG_STRATEGIES,
+                            MULTI_LEG_STRATEGIES)
+
+S, T, R, SIGMA = 100.0, 0.5, 0.05, 0.25
+K1, K2, K3, K4 = 85.0, 95.0, 105.0, 115.0
+PRICES = np.linspace(50, 150, 41)
+
+
+def call(K):
+    # Net payoff of one long call bought at its model price
+    return np.maximum(PRICES - K, 0) - black_scholes(S, K, T, R, SIGMA, 'call')
+
+
+def put(K):
+    return np.maximum(K - PRICES, 0) - black_scholes(S, K, T, R, SIGMA, 'put')
+
+
+stock = PRICES - S
+
+SINGLE_LEG = {
+    'long_call': call(K2),
+    'long_put': put(K2),
+    'short_call': -call(K2),
+    'short_put': -put(K2),
+    'covered_call': stock - call(K2),
+    'protective_put': stock + put(K2),
+    'cash_secured_put': -put(K2),
+}
+
+MULTI_LEG = {
+    'bull_call_spread': call(K1) - call(K2),
+    'bear_put_spread': put(K1) - put(K2),
+    'iron_condor': -call(K2) + call(K3) - put(K1) + put(K4),
+    'iron_butterfly': -call(K2) - put(K2) + call(K3) + put(K1),
+    'butterfly_spread': call(K1) - 2 * call(K2) + call(K3),
+    'straddle': call(K1) + put(K1),
+    'strangle': put(K1) + call(K2),
+}
+
+
+def test_every_strategy_is_covered():
+    assert set(SINGLE_LEG) == set(SINGLE_LEG_STRATEGIES)
+    assert set(MULTI_LEG) == set(MULTI_LEG_STRATEGIES)
+
+
+@pytest.mark.parametrize('strategy', list(SINGLE_LEG))
+def test_single_leg_payoffs(strategy):
+    prices, payouts, _ = single_leg_strategy(S, K2, T, R, SIGMA, 'call', strategy, prices=PRICES)
+    np.testing.assert_allclose(payouts, SINGLE_LEG[strategy], atol=1e-10)
+
+
+@pytest.mark.parametrize('strategy', list(MULTI_LEG))
+def test_multi_leg_payoffs(strategy):
+    prices, payouts, _ = multi_leg_strategy(S, K1, K2, K3, K4, T, R, SIGMA, strategy, prices=PRICES)
+    np.testing.assert_allclose(payouts, MULTI_LEG[strategy], atol=1e-10)
+
+
+def test_unknown_strategy():
+    assert single_leg_strategy(S, K2, T, R, SIGMA, 'call', 'collar')[2] == "Strategy not found."
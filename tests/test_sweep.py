@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest_utils import backtest_portfolio
+from src.strategies import straddle
+from src.sweep import run_sweep, summarize_pnl, RESULT_COLUMNS
+
+DATES = pd.bdate_range('2021-01-01', '2021-06-30')
+
+
+def _history(seed):
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.01, DATES.size)))
+    return pd.DataFrame({'Date': DATES, 'Close': close})
+
+
+def test_matches_backtest_portfolio():
+    price_data = {'AAA': _history(0), 'BBB': _history(1)}
+    result = run_sweep(price_data, [0.95, 1.0, 1.05], [0.25, 0.5], ['long_call', 'straddle'], '2021-01-01',
+                       '2021-06-30', max_workers=1, chunk_size=2, progress=False)
+    assert list(result.columns) == RESULT_COLUMNS
+    assert len(result) == 2 * 3 * 2 * 2
+
+    row = result[(result['Ticker'] == 'BBB') & (result['Strike'] == 1.05) & (result['Expiry'] == 0.25)
+                 & (result['Strategy'] == 'straddle')].iloc[0]
+    backtest = backtest_portfolio(DATES, price_data['BBB']['Close'], straddle(1.05, 0.25), relative_strikes=True)
+    summary = summarize_pnl(backtest['position_pnl'])
+    assert row['Total PnL'] == pytest.approx(summary['Total PnL'][0])
+    assert row['Max Drawdown'] == pytest.approx(summary['Max Drawdown'][0])
+    assert row['Sharpe'] == pytest.approx(summary['Sharpe'][0])
+    assert row['Final Value'] == pytest.approx(backtest['value'][-1, 0])
+    assert row['Rolls'] == backtest['roll'].sum() > 0
+
+
+def test_no_tickers_gives_an_empty_table():
+    result = run_sweep({}, [1.0], [0.25], ['long_call'], '2021-01-01', '2021-06-30', progress=False)
+    assert result.empty
+    assert list(result.columns) == RESULT_COLUMNS